@@ -1,7 +1,10 @@
 """Lightweight connection handling for MCP servers."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from contextlib import AsyncExitStack
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any
 
 from mcp import ClientSession, StdioServerParameters
@@ -9,6 +12,12 @@ from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
 
+# Attempts to reopen a retired pooled connection before its slot is given up
+REOPEN_ATTEMPTS = 5
+# Seconds before the first reopen retry; doubles per attempt up to the max
+REOPEN_BACKOFF_S = 0.5
+REOPEN_BACKOFF_MAX_S = 10.0
+
 
 class MCPConnection(ABC):
     """Base class for MCP server connections."""
@@ -69,6 +78,10 @@ class MCPConnection(ABC):
         result = await self.session.call_tool(tool_name, arguments=arguments)
         return result.content
 
+    async def ping(self) -> None:
+        """Check that the server still answers; raises if it does not."""
+        await self.session.send_ping()
+
 
 class MCPConnectionStdio(MCPConnection):
     """MCP connection using standard input/output."""
@@ -149,3 +162,206 @@ def create_connection(
 
     else:
         raise ValueError(f"Unsupported transport type: {transport}. Use 'stdio', 'sse', or 'http'")
+
+
+class _PoolSlot:
+    """One pooled connection and its usage counters."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.connection: MCPConnection | None = None
+        self.error: BaseException | None = None
+        self.ready = asyncio.Event()
+        self.retire = asyncio.Event()
+        # Failed a ping: no new borrowers, retired when the last one releases it
+        self.draining = False
+        self.task: asyncio.Task | None = None
+        self.active = 0
+        self.tasks = 0
+        self.replacements = 0
+        self.busy_s = 0.0
+        self.busy_since = 0.0
+        self.last_healthy = 0.0
+
+
+class MCPConnectionPool:
+    """N connections to the same MCP server, handed out per task.
+
+    Each connection is a separate session (for stdio, a separate server
+    process), so concurrent tool calls do not queue on one pipe. acquire()
+    picks the least busy live connection, pinging it first if it has not
+    been seen healthy for health_check_interval seconds. One that fails the
+    ping is no longer handed out, and is closed and replaced with a fresh one
+    once every task still using it has released it. Reopening is retried with
+    exponential backoff, up to REOPEN_ATTEMPTS times.
+
+    Every connection is opened and closed by its own task, since the MCP
+    client transports must exit in the task that entered them.
+
+    Args:
+        size: Number of connections
+        health_check_interval: Seconds a connection is trusted without a ping
+        health_check_timeout: Seconds to wait for a ping reply
+        **connection_kwargs: Arguments for create_connection
+    """
+
+    def __init__(
+        self,
+        size: int,
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 5.0,
+        **connection_kwargs: Any,
+    ):
+        # Validate the arguments now rather than in the background tasks
+        create_connection(**connection_kwargs)
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._connection_kwargs = connection_kwargs
+        self._slots: list[_PoolSlot] = []
+        self._changed: asyncio.Condition | None = None
+        self._closing = False
+        self._started = 0.0
+
+    async def __aenter__(self):
+        """Open every connection; fails only if none of them could be opened."""
+        self._started = time.monotonic()
+        self._changed = asyncio.Condition()
+        self._slots = [_PoolSlot(i) for i in range(self.size)]
+        for slot in self._slots:
+            slot.task = asyncio.create_task(self._run_slot(slot))
+        await asyncio.gather(*(slot.ready.wait() for slot in self._slots))
+        errors = [slot.error for slot in self._slots if slot.error is not None]
+        if len(errors) == len(self._slots):
+            await self.__aexit__(None, None, None)
+            raise errors[0]
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close every connection."""
+        self._closing = True
+        for slot in self._slots:
+            slot.retire.set()
+        await asyncio.gather(*(slot.task for slot in self._slots if slot.task), return_exceptions=True)
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _run_slot(self, slot: _PoolSlot) -> None:
+        """Keep one connection open, reopening it whenever it is retired.
+
+        A slot whose first connection cannot be opened fails at once, so a
+        misconfigured server is reported by __aenter__; a reopen is retried
+        with backoff before the slot is given up on.
+        """
+        failures = 0
+        while not self._closing:
+            connection = create_connection(**self._connection_kwargs)
+            try:
+                async with connection:
+                    if slot.ready.is_set():
+                        slot.replacements += 1
+                    slot.connection = connection
+                    slot.last_healthy = time.monotonic()
+                    failures = 0
+                    slot.ready.set()
+                    await self._notify()
+                    await slot.retire.wait()
+            except Exception as e:
+                if slot.connection is not connection:
+                    failures += 1
+                    if not slot.ready.is_set() or failures >= REOPEN_ATTEMPTS:
+                        # Could not (re)open: give up on this slot
+                        slot.error = e
+                        slot.ready.set()
+                        await self._notify()
+                        return
+                # Closing a dead connection may fail; it is gone either way
+            finally:
+                slot.connection = None
+                slot.draining = False
+                slot.retire.clear()
+            if failures:
+                delay = min(REOPEN_BACKOFF_S * 2 ** (failures - 1), REOPEN_BACKOFF_MAX_S)
+                # Closing the pool sets retire, which cuts the wait short
+                try:
+                    await asyncio.wait_for(slot.retire.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _healthy(self, slot: _PoolSlot) -> bool:
+        if time.monotonic() - slot.last_healthy < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(slot.connection.ping(), self.health_check_timeout)
+        except Exception:
+            return False
+        slot.last_healthy = time.monotonic()
+        return True
+
+    def _reserve(self, slot: _PoolSlot) -> None:
+        if slot.active == 0:
+            slot.busy_since = time.monotonic()
+        slot.active += 1
+
+    def _unreserve(self, slot: _PoolSlot) -> None:
+        slot.active -= 1
+        if slot.active == 0:
+            slot.busy_s += time.monotonic() - slot.busy_since
+            if slot.draining:
+                slot.retire.set()
+
+    async def _checkout(self) -> _PoolSlot:
+        while True:
+            async with self._changed:
+                live = [slot for slot in self._slots if slot.error is None]
+                if not live:
+                    raise RuntimeError(f"All {self.size} MCP connections failed: {self._slots[0].error}")
+                ready = [
+                    slot for slot in live
+                    if slot.connection is not None and not slot.draining and not slot.retire.is_set()
+                ]
+                if not ready:
+                    await self._changed.wait()
+                    continue
+                slot = min(ready, key=lambda s: (s.active, s.index))
+                # Count it as busy before the ping so concurrent checkouts spread out
+                self._reserve(slot)
+            if await self._healthy(slot):
+                return slot
+            # Other tasks may still be mid-call on it; close it after they finish
+            slot.draining = True
+            self._unreserve(slot)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[MCPConnection]:
+        """Borrow the least busy healthy connection for one task."""
+        slot = await self._checkout()
+        slot.tasks += 1
+        try:
+            yield slot.connection
+        finally:
+            self._unreserve(slot)
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        """Retrieve available tools through any pooled connection."""
+        async with self.acquire() as connection:
+            return await connection.list_tools()
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Per-connection tasks served, busy time, utilization and replacements."""
+        now = time.monotonic()
+        elapsed = max(now - self._started, 1e-9)
+        stats = []
+        for slot in self._slots:
+            busy_s = slot.busy_s + (now - slot.busy_since if slot.active else 0.0)
+            stats.append({
+                "connection": slot.index,
+                "tasks": slot.tasks,
+                "busy_s": round(busy_s, 2),
+                "utilization": round(busy_s / elapsed, 3),
+                "replacements": slot.replacements,
+                "failed": slot.error is not None,
+            })
+        return stats
@@ -5,6 +5,7 @@ This script evaluates MCP servers by running test questions against them using C
 
 import argparse
 import asyncio
+import csv
 import json
 import re
 import sys
@@ -14,9 +15,11 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Any
 
-from anthropic import Anthropic
+from anthropic import DEFAULT_CONNECTION_LIMITS, AsyncAnthropic, DefaultAsyncHttpxClient
 
-from connections import create_connection
+from connections import MCPConnectionPool
+from rate_limit import RateGovernor, acall_with_backoff
+from tool_cache import ToolCatalogCache, default_cache_dir, schema_hash, server_key
 
 EVALUATION_PROMPT = """You are an AI assistant with access to tools.
 
@@ -83,21 +86,123 @@ def extract_xml_content(text: str, tag: str) -> str | None:
     return matches[-1].strip() if matches else None
 
 
+# Rough prompt size ratio, used where exact token counts are not available
+CHARS_PER_TOKEN = 4
+
+
+def percentiles(values: list[float], points: tuple[int, ...] = (50, 95, 99)) -> dict:
+    """Linearly interpolated percentiles, keyed "p50" etc. None when values is empty."""
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    result = {}
+    for p in points:
+        rank = (len(ordered) - 1) * p / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        result[f"p{p}"] = round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 4)
+    return result
+
+
+def create_client(max_connections: int | None = None, max_keepalive_connections: int | None = None) -> AsyncAnthropic:
+    """Async API client; all tasks share its pool of HTTP connections.
+
+    Limits left as None keep the SDK defaults.
+    """
+    if max_connections is None and max_keepalive_connections is None:
+        return AsyncAnthropic()
+    # Built from the SDK's own default so this works with whichever HTTP
+    # library the installed SDK uses
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=DEFAULT_CONNECTION_LIMITS.max_connections if max_connections is None else max_connections,
+        max_keepalive_connections=(
+            DEFAULT_CONNECTION_LIMITS.max_keepalive_connections
+            if max_keepalive_connections is None
+            else max_keepalive_connections
+        ),
+    )
+    return AsyncAnthropic(http_client=DefaultAsyncHttpxClient(limits=limits))
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+async def create_message(client: AsyncAnthropic, governor: RateGovernor, **kwargs) -> Any:
+    """Call the Messages API under the rate governor, retrying when throttled."""
+    # Rough upper bound for the token bucket
+    prompt_chars = sum(len(str(m["content"])) for m in kwargs["messages"]) + len(json.dumps(kwargs.get("tools", [])))
+    return await acall_with_backoff(
+        governor,
+        lambda: client.messages.create(**kwargs),
+        estimated_tokens=kwargs["max_tokens"] + prompt_chars // CHARS_PER_TOKEN,
+    )
+
+
+async def timed_turn(client: AsyncAnthropic, governor: RateGovernor, turns: list[dict[str, Any]], **kwargs) -> Any:
+    """create_message, appending the call's duration and token usage to turns."""
+    start = time.time()
+    response = await create_message(client, governor, **kwargs)
+    usage = getattr(response, "usage", None)
+    turns.append({
+        "duration_s": round(time.time() - start, 4),
+        **{
+            field: getattr(usage, field, None) or 0
+            for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+        },
+    })
+    return response
+
+
+def with_cache_breakpoint(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Copy of tools with a prompt-caching breakpoint after the last one."""
+    if not tools:
+        return tools
+    return tools[:-1] + [{**tools[-1], "cache_control": {"type": "ephemeral"}}]
+
+
+# The system prompt and tools are identical on every turn of every task, so
+# a breakpoint after them lets each request after the first read them from
+# the prompt cache instead of paying for them as fresh input tokens
+CACHED_SYSTEM = [{"type": "text", "text": EVALUATION_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+
+async def execute_tool(connection: Any, tool_name: str, tool_input: dict[str, Any]) -> tuple[str, float]:
+    """Call one tool; errors are returned as the tool's response. Returns (response, duration)."""
+    tool_start_ts = time.time()
+    try:
+        tool_result = await connection.call_tool(tool_name, tool_input)
+        tool_response = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
+    except Exception as e:
+        tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
+        tool_response += traceback.format_exc()
+    return tool_response, time.time() - tool_start_ts
+
+
 async def agent_loop(
-    client: Anthropic,
+    client: AsyncAnthropic,
     model: str,
     question: str,
     tools: list[dict[str, Any]],
     connection: Any,
-) -> tuple[str, dict[str, Any]]:
-    """Run the agent loop with MCP tools."""
+    governor: RateGovernor,
+) -> tuple[str, dict[str, Any], list[dict[str, Any]]]:
+    """Run the agent loop with MCP tools. Returns (response, tool metrics, API turns)."""
     messages = [{"role": "user", "content": question}]
+    tools = with_cache_breakpoint(tools)
+    turns = []
 
-    response = await asyncio.to_thread(
-        client.messages.create,
+    response = await timed_turn(
+        client,
+        governor,
+        turns,
         model=model,
         max_tokens=4096,
-        system=EVALUATION_PROMPT,
+        system=CACHED_SYSTEM,
         messages=messages,
         tools=tools,
     )
@@ -107,38 +212,35 @@ async def agent_loop(
     tool_metrics = {}
 
     while response.stop_reason == "tool_use":
-        tool_use = next(block for block in response.content if block.type == "tool_use")
-        tool_name = tool_use.name
-        tool_input = tool_use.input
+        # The model may ask for several independent tools in one turn; run
+        # them all at once and answer with every result in a single turn
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        outcomes = await asyncio.gather(
+            *(execute_tool(connection, tool_use.name, tool_use.input) for tool_use in tool_uses)
+        )
 
-        tool_start_ts = time.time()
-        try:
-            tool_result = await connection.call_tool(tool_name, tool_input)
-            tool_response = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
-        except Exception as e:
-            tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
-            tool_response += traceback.format_exc()
-        tool_duration = time.time() - tool_start_ts
-
-        if tool_name not in tool_metrics:
-            tool_metrics[tool_name] = {"count": 0, "durations": []}
-        tool_metrics[tool_name]["count"] += 1
-        tool_metrics[tool_name]["durations"].append(tool_duration)
-
-        messages.append({
-            "role": "user",
-            "content": [{
+        tool_results = []
+        for tool_use, (tool_response, tool_duration) in zip(tool_uses, outcomes):
+            if tool_use.name not in tool_metrics:
+                tool_metrics[tool_use.name] = {"count": 0, "durations": [], "response_bytes": []}
+            tool_metrics[tool_use.name]["count"] += 1
+            tool_metrics[tool_use.name]["durations"].append(tool_duration)
+            tool_metrics[tool_use.name]["response_bytes"].append(len(tool_response.encode("utf-8")))
+            tool_results.append({
                 "type": "tool_result",
                 "tool_use_id": tool_use.id,
                 "content": tool_response,
-            }]
-        })
+            })
 
-        response = await asyncio.to_thread(
-            client.messages.create,
+        messages.append({"role": "user", "content": tool_results})
+
+        response = await timed_turn(
+            client,
+            governor,
+            turns,
             model=model,
             max_tokens=4096,
-            system=EVALUATION_PROMPT,
+            system=CACHED_SYSTEM,
             messages=messages,
             tools=tools,
         )
@@ -148,22 +250,23 @@ async def agent_loop(
         (block.text for block in response.content if hasattr(block, "text")),
         None,
     )
-    return response_text, tool_metrics
+    return response_text, tool_metrics, turns
 
 
 async def evaluate_single_task(
-    client: Anthropic,
+    client: AsyncAnthropic,
     model: str,
     qa_pair: dict[str, Any],
     tools: list[dict[str, Any]],
     connection: Any,
     task_index: int,
+    governor: RateGovernor,
 ) -> dict[str, Any]:
     """Evaluate a single QA pair with the given tools."""
     start_time = time.time()
 
     print(f"Task {task_index + 1}: Running task with question: {qa_pair['question']}")
-    response, tool_metrics = await agent_loop(client, model, qa_pair["question"], tools, connection)
+    response, tool_metrics, turns = await agent_loop(client, model, qa_pair["question"], tools, connection, governor)
 
     response_value = extract_xml_content(response, "response")
     summary = extract_xml_content(response, "summary")
@@ -179,6 +282,9 @@ async def evaluate_single_task(
         "total_duration": duration_seconds,
         "tool_calls": tool_metrics,
         "num_tool_calls": sum(len(metrics["durations"]) for metrics in tool_metrics.values()),
+        "turns": turns,
+        "input_tokens": sum(turn["input_tokens"] for turn in turns),
+        "output_tokens": sum(turn["output_tokens"] for turn in turns),
         "summary": summary,
         "feedback": feedback,
     }
@@ -193,10 +299,27 @@ REPORT_HEADER = """
 - **Average Task Duration**: {average_duration_s:.2f}s
 - **Average Tool Calls per Task**: {average_tool_calls:.2f}
 - **Total Tool Calls**: {total_tool_calls}
+- **Average API Turns per Task**: {average_turns:.2f}
+- **API Turn Latency**: p50 {turn_p50_s:.2f}s, p95 {turn_p95_s:.2f}s, max {turn_max_s:.2f}s
+- **API Tokens**: {input_tokens} input, {output_tokens} output, {cache_read_input_tokens} read from cache, {cache_creation_input_tokens} written to cache
+
+## Tool Performance
+
+| Tool | Calls | p50 | p95 | Max | Avg Response | Est. Response Tokens |
+|------|-------|-----|-----|-----|--------------|----------------------|
+{tool_rows}
 
 ---
 """
 
+TOOL_ROW_TEMPLATE = "| {tool} | {calls} | {p50_s:.2f}s | {p95_s:.2f}s | {max_s:.2f}s | {mean_response_bytes:.0f} B | {est_response_tokens} |"
+
+# Columns of the per-tool CSV export
+TOOL_METRIC_FIELDS = [
+    "tool", "calls", "p50_s", "p95_s", "max_s", "total_s",
+    "total_response_bytes", "mean_response_bytes", "max_response_bytes", "est_response_tokens",
+]
+
 TASK_TEMPLATE = """
 ### Task {task_num}
 
@@ -205,6 +328,7 @@ TASK_TEMPLATE = """
 **Actual Answer**: `{actual_answer}`
 **Correct**: {correct_indicator}
 **Duration**: {total_duration:.2f}s
+**API Turns**: {num_turns} ({input_tokens} input / {output_tokens} output tokens)
 **Tool Calls**: {tool_calls}
 
 **Summary**
@@ -217,33 +341,160 @@ TASK_TEMPLATE = """
 """
 
 
+def compute_metrics(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate per-tool latency and payload sizes, and API turns and tokens, over all tasks."""
+    by_tool: dict[str, dict[str, list]] = {}
+    for result in results:
+        for name, metrics in result["tool_calls"].items():
+            merged = by_tool.setdefault(name, {"durations": [], "response_bytes": []})
+            merged["durations"].extend(metrics["durations"])
+            merged["response_bytes"].extend(metrics["response_bytes"])
+
+    tools = []
+    for name, merged in by_tool.items():
+        durations, sizes = merged["durations"], merged["response_bytes"]
+        stats = percentiles(durations, (50, 95))
+        tools.append({
+            "tool": name,
+            "calls": len(durations),
+            "p50_s": stats["p50"],
+            "p95_s": stats["p95"],
+            "max_s": round(max(durations), 4),
+            "total_s": round(sum(durations), 4),
+            "total_response_bytes": sum(sizes),
+            "mean_response_bytes": round(sum(sizes) / len(sizes), 1),
+            "max_response_bytes": max(sizes),
+            "est_response_tokens": sum(sizes) // CHARS_PER_TOKEN,
+        })
+    # Slowest tools in total first: those are the ones worth optimizing
+    tools.sort(key=lambda t: t["total_s"], reverse=True)
+
+    turns = [turn for result in results for turn in result["turns"]]
+    turn_durations = [turn["duration_s"] for turn in turns]
+    stats = percentiles(turn_durations, (50, 95))
+    api = {
+        "turns": len(turns),
+        "average_turns_per_task": len(turns) / len(results) if results else 0,
+        "p50_s": stats["p50"] or 0.0,
+        "p95_s": stats["p95"] or 0.0,
+        "max_s": max(turn_durations, default=0.0),
+        **{
+            field: sum(turn[field] for turn in turns)
+            for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+        },
+    }
+
+    return {
+        "tools": tools,
+        "api": api,
+        "tasks": [
+            {
+                "task": i + 1,
+                "score": result["score"],
+                "duration_s": round(result["total_duration"], 4),
+                "tool_calls": result["num_tool_calls"],
+                "turns": result["turns"],
+            }
+            for i, result in enumerate(results)
+        ],
+    }
+
+
+def write_metrics(metrics: dict[str, Any], path: Path) -> None:
+    """Export metrics as JSON, or as a per-tool CSV if path ends in .csv."""
+    if path.suffix.lower() != ".csv":
+        path.write_text(json.dumps(metrics, indent=2))
+        return
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=TOOL_METRIC_FIELDS)
+        writer.writeheader()
+        writer.writerows(metrics["tools"])
+
+
 async def run_evaluation(
     eval_path: Path,
     connection: Any,
     model: str = "claude-3-7-sonnet-20250219",
+    governor: RateGovernor | None = None,
+    concurrency: int = 1,
+    tool_cache: ToolCatalogCache | None = None,
+    tool_cache_key: str | None = None,
+    client: AsyncAnthropic | None = None,
+    metrics_output: Path | None = None,
 ) -> str:
-    """Run evaluation with MCP server tools."""
-    print("🚀 Starting Evaluation")
+    """Run evaluation with MCP server tools.
 
-    client = Anthropic()
+    With a tool_cache, a cached catalog lets tasks start without waiting for
+    list_tools; the catalog is still refreshed in the background, and if it
+    changed, tasks that have not started yet get the new one.
 
-    tools = await connection.list_tools()
-    print(f"📋 Loaded {len(tools)} tools from MCP server")
+    Up to `concurrency` tasks run at once; the report keeps the order of the
+    evaluation file. `connection` may be an MCPConnectionPool, in which case
+    each task borrows the least busy connection, so a slow tool call on one
+    server does not hold up tasks on the others.
+
+    API calls go through `client` (a default AsyncAnthropic if None), so
+    in-flight requests cost a connection from its pool rather than a thread.
+
+    If metrics_output is given, the metrics summarized in the report are
+    also written there (see write_metrics).
+    """
+    print("🚀 Starting Evaluation")
+
+    if client is None:
+        async with AsyncAnthropic() as client:
+            return await run_evaluation(
+                eval_path, connection, model, governor, concurrency, tool_cache, tool_cache_key, client, metrics_output
+            )
+    if governor is None:
+        governor = RateGovernor(concurrency)
+
+    tools = tool_cache.get(tool_cache_key) if tool_cache is not None else None
+    refresh = None
+    if tools is None:
+        tools = await connection.list_tools()
+        print(f"📋 Loaded {len(tools)} tools from MCP server")
+        if tool_cache is not None:
+            tool_cache.put(tool_cache_key, tools)
+    else:
+        print(f"📋 Loaded {len(tools)} tools from cache")
+
+        async def refresh_tools() -> None:
+            fresh = await connection.list_tools()
+            if schema_hash(fresh) != schema_hash(tools):
+                print("⚠️  Tool catalog changed since it was cached; using the new one for remaining tasks")
+                tools[:] = fresh
+            tool_cache.put(tool_cache_key, fresh)
+
+        refresh = asyncio.create_task(refresh_tools())
 
     qa_pairs = parse_evaluation_file(eval_path)
     print(f"📋 Loaded {len(qa_pairs)} evaluation tasks")
 
-    results = []
-    for i, qa_pair in enumerate(qa_pairs):
-        print(f"Processing task {i + 1}/{len(qa_pairs)}")
-        result = await evaluate_single_task(client, model, qa_pair, tools, connection, i)
-        results.append(result)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_task(i: int, qa_pair: dict[str, Any]) -> dict[str, Any]:
+        async with semaphore:
+            print(f"Processing task {i + 1}/{len(qa_pairs)}")
+            if not isinstance(connection, MCPConnectionPool):
+                return await evaluate_single_task(client, model, qa_pair, tools, connection, i, governor)
+            async with connection.acquire() as pooled:
+                return await evaluate_single_task(client, model, qa_pair, tools, pooled, i, governor)
+
+    results = await asyncio.gather(*(run_task(i, qa_pair) for i, qa_pair in enumerate(qa_pairs)))
+    if refresh is not None:
+        try:
+            await refresh
+        except Exception as e:
+            print(f"Warning: could not refresh tool catalog: {e}")
 
     correct = sum(r["score"] for r in results)
     accuracy = (correct / len(results)) * 100 if results else 0
     average_duration_s = sum(r["total_duration"] for r in results) / len(results) if results else 0
     average_tool_calls = sum(r["num_tool_calls"] for r in results) / len(results) if results else 0
     total_tool_calls = sum(r["num_tool_calls"] for r in results)
+    metrics = compute_metrics(results)
+    api = metrics["api"]
 
     report = REPORT_HEADER.format(
         correct=correct,
@@ -252,6 +503,15 @@ async def run_evaluation(
         average_duration_s=average_duration_s,
         average_tool_calls=average_tool_calls,
         total_tool_calls=total_tool_calls,
+        average_turns=api["average_turns_per_task"],
+        turn_p50_s=api["p50_s"],
+        turn_p95_s=api["p95_s"],
+        turn_max_s=api["max_s"],
+        input_tokens=api["input_tokens"],
+        output_tokens=api["output_tokens"],
+        cache_read_input_tokens=api["cache_read_input_tokens"],
+        cache_creation_input_tokens=api["cache_creation_input_tokens"],
+        tool_rows="\n".join(TOOL_ROW_TEMPLATE.format(**tool) for tool in metrics["tools"]) or "| (no tool calls) | | | | | | |",
     )
 
     report += "".join([
@@ -262,6 +522,9 @@ async def run_evaluation(
             actual_answer=result["actual"] or "N/A",
             correct_indicator="✅" if result["score"] else "❌",
             total_duration=result["total_duration"],
+            num_turns=len(result["turns"]),
+            input_tokens=result["input_tokens"],
+            output_tokens=result["output_tokens"],
             tool_calls=json.dumps(result["tool_calls"], indent=2),
             summary=result["summary"] or "N/A",
             feedback=result["feedback"] or "N/A",
@@ -269,6 +532,10 @@ async def run_evaluation(
         for i, (qa_pair, result) in enumerate(zip(qa_pairs, results))
     ])
 
+    if metrics_output:
+        write_metrics(metrics, metrics_output)
+        print(f"📈 Metrics saved to {metrics_output}")
+
     return report
 
 
@@ -316,6 +583,9 @@ Examples:
 
   # Evaluate an HTTP MCP server with custom model
   python evaluation.py -t http -u https://example.com/mcp -m claude-3-5-sonnet-20241022 eval.xml
+
+  # Run 8 tasks at once over 4 stdio server processes
+  python evaluation.py -t stdio -c python -a my_server.py -j 8 --connections 4 eval.xml
         """,
     )
 
@@ -333,6 +603,17 @@ Examples:
     remote_group.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
 
     parser.add_argument("-o", "--output", type=Path, help="Output file for evaluation report (default: stdout)")
+    parser.add_argument("--metrics-output", type=Path, help="Also export latency and token metrics to this file (.json, or .csv for a per-tool table)")
+    parser.add_argument("-j", "--concurrency", type=int, default=1, help="Number of tasks to run at once (default: 1)")
+    parser.add_argument("--connections", type=int, default=1, help="Number of MCP server connections to spread tasks over (default: 1)")
+    parser.add_argument("--tool-cache-dir", type=Path, default=None, help=f"Tool catalog cache directory (default: {default_cache_dir()})")
+    parser.add_argument("--no-tool-cache", action="store_true", help="Always list tools from the server, ignoring and not updating the cache")
+    parser.add_argument("--api-max-connections", type=positive_int, help="Maximum HTTP connections to the Claude API (default: SDK default)")
+    parser.add_argument("--api-keepalive-connections", type=positive_int, help="Idle HTTP connections to the Claude API kept open for reuse (default: SDK default)")
+
+    limits_group = parser.add_argument_group("rate limits")
+    limits_group.add_argument("--requests-per-minute", type=float, help="Cap on Claude API requests per minute")
+    limits_group.add_argument("--tokens-per-minute", type=float, help="Cap on Claude API tokens per minute")
 
     args = parser.parse_args()
 
@@ -344,7 +625,8 @@ Examples:
     env_vars = parse_env_vars(args.env) if args.env else None
 
     try:
-        connection = create_connection(
+        pool = MCPConnectionPool(
+            args.connections,
             transport=args.transport,
             command=args.command,
             args=args.args,
@@ -358,9 +640,26 @@ Examples:
 
     print(f"🔗 Connecting to MCP server via {args.transport}...")
 
-    async with connection:
-        print("✅ Connected successfully")
-        report = await run_evaluation(args.eval_file, connection, args.model)
+    async with pool, create_client(args.api_max_connections, args.api_keepalive_connections) as client:
+        print(f"✅ Connected successfully ({pool.size} connection{'s' if pool.size > 1 else ''})")
+        governor = RateGovernor(args.concurrency, requests_per_minute=args.requests_per_minute, tokens_per_minute=args.tokens_per_minute)
+        tool_cache = None if args.no_tool_cache else ToolCatalogCache(args.tool_cache_dir or default_cache_dir())
+        report = await run_evaluation(
+            args.eval_file,
+            pool,
+            args.model,
+            governor,
+            concurrency=args.concurrency,
+            tool_cache=tool_cache,
+            tool_cache_key=server_key(args.transport, args.command, args.args, env_vars, args.url, headers),
+            client=client,
+            metrics_output=args.metrics_output,
+        )
+
+        print("📊 Connection utilization:")
+        for stats in pool.stats():
+            status = "failed" if stats["failed"] else f"{stats['replacements']} replaced"
+            print(f"  #{stats['connection']}: {stats['tasks']} tasks, busy {stats['busy_s']:.1f}s ({stats['utilization']:.0%}), {status}")
 
         if args.output:
             args.output.write_text(report)
@@ -0,0 +1,288 @@
+"""Rate limiting and adaptive concurrency for scripts that call the API.
+
+A RateGovernor combines:
+
+- token buckets for requests/minute and tokens/minute, so a run stays under
+  the org quota instead of bursting into it
+- an AIMD concurrency limit: every throttle signal (HTTP 429, 529
+  overloaded) halves the number of calls allowed in flight and pauses new
+  ones for the server's retry-after (or an exponential backoff), and every
+  success ramps the limit back up towards its maximum
+
+Calls take a slot from the governor and report how they went through the
+Permit they get back. call_with_backoff / acall_with_backoff wrap an SDK
+call in a slot and retry it when it is throttled.
+
+Stdlib only, and kept identical in skill-creator/scripts and
+mcp-builder/scripts so each skill stays self-contained.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Fraction of the concurrency limit kept after a throttle
+BACKOFF_FACTOR = 0.5
+# Pause after the first throttle without retry-after, doubled on each consecutive one
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+# How often async waiters re-check for a free slot
+POLL_INTERVAL_SECONDS = 0.05
+DEFAULT_MAX_RETRIES = 6
+
+THROTTLE_STATUS_CODES = (429, 529)
+THROTTLE_TEXT = re.compile(r"\b(429|529)\b|rate[ _-]?limit|overloaded", re.IGNORECASE)
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """Whether an exception (e.g. anthropic.RateLimitError) signals throttling."""
+    if getattr(exc, "status_code", None) in THROTTLE_STATUS_CODES:
+        return True
+    return type(exc).__name__ in ("RateLimitError", "OverloadedError")
+
+
+def is_throttle_text(text: str) -> bool:
+    """Whether an error message (e.g. from `claude -p`) reports throttling."""
+    return bool(THROTTLE_TEXT.search(text))
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """The retry-after header of an API error, if it has one."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def usage_tokens(response: Any) -> int | None:
+    """Total tokens billed for an API response, or None if it has no usage."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return sum(
+        getattr(usage, field, None) or 0
+        for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+    )
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding at most one minute's allowance."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 if it can be now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) the difference between estimated and actual use."""
+        self.level = min(self.capacity, self.level - amount)
+
+
+class Permit:
+    """One call's slot; tell it how the call went before the slot is released."""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: int | None = None
+        self.throttled = False
+        self.retry_after: float | None = None
+
+    def used(self, tokens: int | None) -> None:
+        self.actual_tokens = tokens
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        self.throttled = True
+        self.retry_after = retry_after
+
+
+class RateGovernor:
+    """Thread-safe limiter shared by every call to one API.
+
+    Usable from threads (slot) and from asyncio code (slot_async) at the
+    same time. requests_per_minute and tokens_per_minute are optional; the
+    adaptive concurrency limit always applies.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        min_concurrency: int = 1,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight = 0
+        self.throttles = 0
+        self._consecutive_throttles = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def _try_acquire(self, tokens: int) -> float | None:
+        """Take a slot and return 0, or return how long to wait (None = until a release)."""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None and tokens:
+            self.tokens.take(tokens)
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self, tokens: int = 0) -> Permit:
+        with self._cond:
+            while (wait := self._try_acquire(tokens)) != 0:
+                self._cond.wait(wait)
+        return Permit(tokens)
+
+    async def acquire_async(self, tokens: int = 0) -> Permit:
+        while True:
+            with self._cond:
+                wait = self._try_acquire(tokens)
+            if wait == 0:
+                return Permit(tokens)
+            await asyncio.sleep(POLL_INTERVAL_SECONDS if wait is None else min(wait, 1.0))
+
+    def release(self, permit: Permit) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if self.tokens is not None:
+                if permit.actual_tokens is not None:
+                    self.tokens.adjust(permit.actual_tokens - permit.estimated_tokens)
+                elif permit.throttled:
+                    # A rejected request used no quota
+                    self.tokens.adjust(-permit.estimated_tokens)
+            if permit.throttled:
+                self._on_throttle(permit.retry_after)
+            else:
+                self._consecutive_throttles = 0
+                # Additive increase: about +1 per limit's worth of successes
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def _on_throttle(self, retry_after: float | None) -> None:
+        now = time.monotonic()
+        self.throttles += 1
+        # Throttles reported by calls that were already in flight when the
+        # first one hit belong to the same event; shrink only once for them
+        if now >= self._paused_until:
+            self.limit = max(self.min_concurrency, self.limit * BACKOFF_FACTOR)
+        backoff = retry_after
+        if backoff is None:
+            backoff = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** self._consecutive_throttles)
+            backoff *= random.uniform(0.5, 1.0)
+        self._consecutive_throttles += 1
+        self._paused_until = max(self._paused_until, now + backoff)
+
+    @contextmanager
+    def slot(self, tokens: int = 0) -> Iterator[Permit]:
+        """Hold a slot for one call. Throttle exceptions raised inside are recorded."""
+        permit = self.acquire(tokens)
+        try:
+            yield permit
+        except BaseException as e:
+            if is_throttle_error(e):
+                permit.throttle(retry_after_seconds(e))
+            raise
+        finally:
+            self.release(permit)
+
+    @asynccontextmanager
+    async def slot_async(self, tokens: int = 0) -> AsyncIterator[Permit]:
+        """Async form of slot()."""
+        permit = await self.acquire_async(tokens)
+        try:
+            yield permit
+        except BaseException as e:
+            if is_throttle_error(e):
+                permit.throttle(retry_after_seconds(e))
+            raise
+        finally:
+            self.release(permit)
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": int(self.limit),
+            "max_concurrency": self.max_concurrency,
+            "throttles": self.throttles,
+        }
+
+
+def call_with_backoff(
+    governor: RateGovernor,
+    call: Callable[[], T],
+    estimated_tokens: int = 0,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> T:
+    """Run call() in a governor slot, retrying while it is throttled.
+
+    The governor's pause is the backoff: the retry waits in acquire().
+    """
+    attempt = 0
+    while True:
+        try:
+            with governor.slot(estimated_tokens) as permit:
+                response = call()
+                permit.used(usage_tokens(response))
+                return response
+        except Exception as e:
+            if not is_throttle_error(e) or attempt >= max_retries:
+                raise
+        attempt += 1
+
+
+async def acall_with_backoff(
+    governor: RateGovernor,
+    call: Callable[[], Awaitable[T]],
+    estimated_tokens: int = 0,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> T:
+    """Async form of call_with_backoff(); call returns an awaitable."""
+    attempt = 0
+    while True:
+        try:
+            async with governor.slot_async(estimated_tokens) as permit:
+                response = await call()
+                permit.used(usage_tokens(response))
+                return response
+        except Exception as e:
+            if not is_throttle_error(e) or attempt >= max_retries:
+                raise
+        attempt += 1
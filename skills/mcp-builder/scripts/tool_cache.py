@@ -0,0 +1,90 @@
+"""Local cache of MCP server tool catalogs.
+
+Listing tools means a round trip to a freshly started server before any
+task can run. The catalog of each server is stored on disk, keyed by how the
+server is reached (transport, command and arguments, or URL) and, for local
+servers, the modification times of files named in the arguments, so editing
+the server's code invalidates its entry. Each entry also records a hash of
+the tool schemas, which evaluation.py compares against a background refresh
+to notice servers that changed without their files changing.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+def default_cache_dir() -> Path:
+    """Return the default cache directory (respects XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "mcp-builder" / "tools"
+
+
+def schema_hash(tools: list[dict[str, Any]]) -> str:
+    """Hash of tool names, descriptions and input schemas, independent of order."""
+    payload = json.dumps(sorted(tools, key=lambda t: t["name"]), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def server_key(
+    transport: str,
+    command: str = None,
+    args: list[str] = None,
+    env: dict[str, str] = None,
+    url: str = None,
+    headers: dict[str, str] = None,
+) -> str:
+    """Identify a server by how it is reached and the files it is started from.
+
+    env and headers are part of the key since credentials can change which
+    tools a server exposes; only their hash is stored.
+    """
+    files = {}
+    for arg in args or []:
+        path = Path(arg)
+        if path.is_file():
+            stat = path.stat()
+            files[str(path.resolve())] = [stat.st_mtime_ns, stat.st_size]
+    payload = json.dumps([transport.lower(), command, args or [], env or {}, url, headers or {}, files], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ToolCatalogCache:
+    """One JSON file per server holding its tool list and schema hash."""
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        """Cached tools for a server, or None if missing, expired or unreadable."""
+        try:
+            entry = json.loads(self._path(key).read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - entry.get("fetched_at", 0) > self.ttl_seconds:
+            return None
+        tools = entry.get("tools")
+        if not isinstance(tools, list) or entry.get("schema_hash") != schema_hash(tools):
+            return None
+        return tools
+
+    def put(self, key: str, tools: list[dict[str, Any]]) -> None:
+        """Store a server's tools, replacing the entry atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "fetched_at": time.time(),
+            "schema_hash": schema_hash(tools),
+            "tools": tools,
+        }))
+        os.replace(tmp, path)
@@ -2,18 +2,24 @@
 """Generate and serve a review page for eval results.
 
 Reads the workspace directory, discovers runs (directories with outputs/),
-embeds all output data into a self-contained HTML page, and serves it via
-a tiny HTTP server. Feedback auto-saves to feedback.json in the workspace.
+and serves a review page via a tiny HTTP server. The page carries only
+metadata for each output file; the viewer fetches file bodies from
+/api/file/<run_id>/<name> as they are shown. With --static, all output data
+is embedded instead so the page is self-contained. Feedback auto-saves to
+the workspace: each save is appended to feedback.journal.jsonl and folded
+into feedback.json when the review is submitted (see FeedbackJournal).
 
 Usage:
     python generate_review.py <workspace-path> [--port PORT] [--skill-name NAME]
     python generate_review.py <workspace-path> --previous-feedback /path/to/old/feedback.json
 
-No dependencies beyond the Python stdlib are required.
+No dependencies beyond the Python stdlib are required. If the brotli package
+is installed, pages and JSON are also offered brotli-compressed.
 """
 
 import argparse
 import base64
+import hashlib
 import json
 import mimetypes
 import os
@@ -21,15 +27,28 @@ import re
 import signal
 import subprocess
 import sys
+import threading
 import time
 import webbrowser
+import zlib
+from collections import OrderedDict, deque
+from email.utils import formatdate, parsedate_to_datetime
 from functools import partial
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Files to exclude from output listings
 METADATA_FILES = {"transcript.md", "user_notes.md", "metrics.json"}
 
+# Directories never searched for runs
+SKIP_DIRS = {"node_modules", ".git", "__pycache__", "skill", "inputs"}
+
 # Extensions we render as inline text
 TEXT_EXTENSIONS = {
     ".txt", ".md", ".json", ".csv", ".py", ".js", ".ts", ".tsx", ".jsx",
@@ -49,6 +68,32 @@ MIME_OVERRIDES = {
 }
 
 
+# Read size when streaming file bodies and hashing
+CHUNK_SIZE = 64 * 1024
+
+# Changes kept for /api/events clients that reconnect; older ones get a reset
+MAX_EVENT_LOG = 1000
+# Seconds between keepalive comments on an idle /api/events stream
+SSE_HEARTBEAT_SECONDS = 15.0
+DEFAULT_RUNS_PAGE_SIZE = 100
+# HTML/JSON bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+# Bodies larger than this are compressed and sent chunk by chunk
+STREAM_THRESHOLD_BYTES = 256 * 1024
+
+# Saves since feedback.json was last written; merged into it by FeedbackJournal
+FEEDBACK_JOURNAL_NAME = "feedback.journal.jsonl"
+# Journal entries appended before they are folded into feedback.json
+COMPACT_EVERY = 200
+
+# Content hashes of the most recently used files: path -> (size, mtime_ns, hash).
+# Keyed by path so a rewritten file replaces its old entry; least recently
+# used entries are dropped beyond MAX_HASH_CACHE_ENTRIES.
+MAX_HASH_CACHE_ENTRIES = 4096
+_hash_cache: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+_hash_cache_lock = threading.Lock()
+
+
 def get_mime_type(path: Path) -> str:
     ext = path.suffix.lower()
     if ext in MIME_OVERRIDES:
@@ -57,32 +102,211 @@ def get_mime_type(path: Path) -> str:
     return mime or "application/octet-stream"
 
 
-def find_runs(workspace: Path) -> list[dict]:
-    """Recursively find directories that contain an outputs/ subdirectory."""
-    runs: list[dict] = []
-    _find_runs_recursive(workspace, workspace, runs)
-    runs.sort(key=lambda r: (r.get("eval_id", float("inf")), r["id"]))
-    return runs
+def find_runs(workspace: Path, inline: bool = True, file_url: str = "/api/file") -> list[dict]:
+    """Recursively find directories that contain an outputs/ subdirectory.
 
+    With inline=False, output files are described by metadata and a URL
+    under file_url instead of being embedded (see describe_file).
+    """
+    return WorkspaceIndex(workspace, inline, file_url).runs()
 
-def _find_runs_recursive(root: Path, current: Path, runs: list[dict]) -> None:
-    if not current.is_dir():
-        return
 
-    outputs_dir = current / "outputs"
-    if outputs_dir.is_dir():
-        run = build_run(root, current)
-        if run:
-            runs.append(run)
-        return
+def _stat_key(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Files build_run reads, relative to the run directory
+RUN_INPUT_FILES = [
+    "eval_metadata.json",
+    os.path.join("..", "eval_metadata.json"),
+    "transcript.md",
+    os.path.join("outputs", "transcript.md"),
+    "grading.json",
+    os.path.join("..", "grading.json"),
+]
+
+
+def run_signature(run_dir: Path) -> tuple:
+    """Modification times and sizes of everything build_run reads for a run."""
+    # Plain string paths: this runs for every run on every page load
+    run_dir = str(run_dir)
+    outputs_dir = os.path.join(run_dir, "outputs")
+    inputs = [os.path.join(run_dir, name) for name in RUN_INPUT_FILES]
+    outputs = []
+    try:
+        with os.scandir(outputs_dir) as entries:
+            for entry in entries:
+                st = entry.stat()
+                outputs.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        pass
+    return tuple(_stat_key(path) for path in inputs) + tuple(sorted(outputs))
+
+
+class WorkspaceIndex:
+    """Runs of a workspace, parsed once and re-parsed only when they change.
+
+    refresh() walks the directory tree, listing only directories whose
+    mtime changed since the last walk (adding or removing an entry changes
+    it), and rebuilds only runs whose run_signature changed. Reloading a
+    large, mostly unchanged workspace then costs a few stat calls per run.
+    Safe to share between request threads.
+
+    After the first refresh, every new, changed or removed run is logged
+    as a numbered event ({"type": "run", "run": ...} or {"type": "removed",
+    "id": ...}) for events_since(); watch() refreshes in the background so
+    those events arrive without any page being loaded. Clients track their
+    position as a cursor, "<epoch>-<seq>", so a seq handed out by an earlier
+    server process is never mistaken for one of this process's.
+    """
+
+    def __init__(self, workspace: Path, inline: bool = True, file_url: str = "/api/file"):
+        self.workspace = workspace
+        self.inline = inline
+        self.file_url = file_url
+        # directory -> (mtime_ns, subdirectories to search)
+        self._dirs: dict[Path, tuple[int, list[Path]]] = {}
+        # run_id -> (run_signature, run dict)
+        self._runs: dict[str, tuple[tuple, dict | None]] = {}
+        self._run_dirs: dict[str, Path] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._scanned = False
+        # Distinguishes this process's seq numbers from a previous server's
+        self.epoch = f"{time.time_ns():x}"
+        self.seq = 0
+        self._events: deque[tuple[int, dict]] = deque(maxlen=MAX_EVENT_LOG)
+
+    def refresh(self) -> None:
+        with self._lock:
+            run_dirs: dict[str, Path] = {}
+            seen: set[Path] = set()
+            self._scan(self.workspace, run_dirs, seen)
+            self._dirs = {d: entry for d, entry in self._dirs.items() if d in seen}
+
+            runs: dict[str, tuple[tuple, dict | None]] = {}
+            for run_id, run_dir in run_dirs.items():
+                signature = run_signature(run_dir)
+                cached = self._runs.get(run_id)
+                if cached is not None and cached[0] == signature:
+                    runs[run_id] = cached
+                    continue
+                run = build_run(self.workspace, run_dir, self.inline, self.file_url)
+                runs[run_id] = (signature, run)
+                if self._scanned and run:
+                    self._log({"type": "run", "run": run})
+            if self._scanned:
+                for run_id in self._runs.keys() - runs.keys():
+                    self._log({"type": "removed", "id": run_id})
+            self._runs = runs
+            self._run_dirs = run_dirs
+            self._scanned = True
+
+    def _log(self, event: dict) -> None:
+        self.seq += 1
+        self._events.append((self.seq, event))
+        self._changed.notify_all()
+
+    def cursor(self, seq: int) -> str:
+        """Client-facing position of seq in this process's event log."""
+        return f"{self.epoch}-{seq}"
+
+    def events_since(self, epoch: str, seq: int, timeout: float) -> list[tuple[int, dict]] | None:
+        """Events after seq, waiting up to timeout for one.
+
+        Returns None if epoch is not this index's (the cursor is from before
+        a server restart) or events after seq have been dropped from the
+        log, so the caller must reload.
+        """
+        if epoch != self.epoch:
+            return None
+        with self._changed:
+            if seq == self.seq:
+                self._changed.wait(timeout)
+            if seq > self.seq or (self.seq > seq and self._events[0][0] > seq + 1):
+                return None
+            return [(n, event) for n, event in self._events if n > seq]
+
+    def watch(self, interval: float) -> None:
+        """Refresh every interval seconds in a daemon thread."""
+        def loop() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Warning: workspace refresh failed: {e}", file=sys.stderr)
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def _scan(self, current: Path, run_dirs: dict[str, Path], seen: set[Path]) -> None:
+        try:
+            mtime = current.stat().st_mtime_ns
+        except OSError:
+            return
 
-    skip = {"node_modules", ".git", "__pycache__", "skill", "inputs"}
-    for child in sorted(current.iterdir()):
-        if child.is_dir() and child.name not in skip:
-            _find_runs_recursive(root, child, runs)
+        if os.path.isdir(os.path.join(current, "outputs")):
+            run_dirs[get_run_id(self.workspace, current)] = current
+            return
+
+        seen.add(current)
+        cached = self._dirs.get(current)
+        if cached is not None and cached[0] == mtime:
+            children = cached[1]
+        else:
+            try:
+                children = [
+                    child for child in sorted(current.iterdir())
+                    if child.is_dir() and child.name not in SKIP_DIRS
+                ]
+            except OSError:
+                return
+            self._dirs[current] = (mtime, children)
+        for child in children:
+            self._scan(child, run_dirs, seen)
+
+    def runs(self) -> list[dict]:
+        """Refresh, then return all runs in display order."""
+        return self.snapshot()[1]
+
+    def snapshot(self) -> tuple[int, list[dict]]:
+        """Refresh, then return the event seq and all runs as of that seq."""
+        self.refresh()
+        with self._lock:
+            seq = self.seq
+            runs = [run for _, run in self._runs.values() if run]
+        # eval_id is None for runs without eval_metadata.json
+        runs.sort(key=lambda r: (r["eval_id"] if r["eval_id"] is not None else float("inf"), r["id"]))
+        return seq, runs
+
+    def get_run_dir(self, run_id: str) -> Path | None:
+        """Directory of a run, refreshing first if the run is not known yet."""
+        if run_id not in self._run_dirs:
+            self.refresh()
+        return self._run_dirs.get(run_id)
+
+
+def parse_cursor(value: str) -> tuple[str, int]:
+    """Split a WorkspaceIndex cursor, "<epoch>-<seq>", into its parts.
+
+    Raises ValueError if it is not in that form.
+    """
+    epoch, sep, seq = value.rpartition("-")
+    if not sep or not epoch:
+        raise ValueError(f"invalid cursor: {value!r}")
+    return epoch, int(seq)
 
 
-def build_run(root: Path, run_dir: Path) -> dict | None:
+def get_run_id(root: Path, run_dir: Path) -> str:
+    """Run id: the run directory's path relative to the workspace, joined with dashes."""
+    return str(run_dir.relative_to(root)).replace("/", "-").replace("\\", "-")
+
+
+def build_run(root: Path, run_dir: Path, inline: bool = True, file_url: str = "/api/file") -> dict | None:
     """Build a run dict with prompt, outputs, and grading data."""
     prompt = ""
     eval_id = None
@@ -116,7 +340,7 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
     if not prompt:
         prompt = "(No prompt found)"
 
-    run_id = str(run_dir.relative_to(root)).replace("/", "-").replace("\\", "-")
+    run_id = get_run_id(root, run_dir)
 
     # Collect output files
     outputs_dir = run_dir / "outputs"
@@ -124,7 +348,10 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
     if outputs_dir.is_dir():
         for f in sorted(outputs_dir.iterdir()):
             if f.is_file() and f.name not in METADATA_FILES:
-                output_files.append(embed_file(f))
+                if inline:
+                    output_files.append(embed_file(f))
+                else:
+                    output_files.append(describe_file(f, f"{file_url}/{quote(run_id, safe='')}/{quote(f.name, safe='')}"))
 
     # Load grading if present
     grading = None
@@ -146,8 +373,63 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
     }
 
 
+def get_file_type(path: Path) -> str:
+    """How the viewer renders a file: text, image, pdf, xlsx or binary."""
+    ext = path.suffix.lower()
+    if ext in TEXT_EXTENSIONS:
+        return "text"
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    if ext in (".pdf", ".xlsx"):
+        return ext[1:]
+    return "binary"
+
+
+def file_hash(path: Path, stat: os.stat_result | None = None) -> str:
+    """Content hash of a file, read in chunks and remembered until it changes."""
+    stat = stat or path.stat()
+    key = str(path)
+    with _hash_cache_lock:
+        entry = _hash_cache.get(key)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            _hash_cache.move_to_end(key)
+            return entry[2]
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            h.update(chunk)
+    digest = h.hexdigest()[:16]
+    with _hash_cache_lock:
+        _hash_cache[key] = (stat.st_size, stat.st_mtime_ns, digest)
+        _hash_cache.move_to_end(key)
+        while len(_hash_cache) > MAX_HASH_CACHE_ENTRIES:
+            _hash_cache.popitem(last=False)
+    return digest
+
+
+def describe_file(path: Path, url: str) -> dict:
+    """Return a file's metadata and the URL the viewer fetches its body from.
+
+    The hash is appended to the URL, so the browser can cache the body for
+    as long as the file is unchanged.
+    """
+    try:
+        stat = path.stat()
+        digest = file_hash(path, stat)
+    except OSError:
+        return {"name": path.name, "type": "error", "content": "(Error reading file)"}
+    return {
+        "name": path.name,
+        "type": get_file_type(path),
+        "mime": get_mime_type(path),
+        "size": stat.st_size,
+        "hash": digest,
+        "url": f"{url}?v={digest}",
+    }
+
+
 def embed_file(path: Path) -> dict:
-    """Read a file and return an embedded representation."""
+    """Read a file and return an embedded representation (used for --static)."""
     ext = path.suffix.lower()
     mime = get_mime_type(path)
 
@@ -210,29 +492,164 @@ def embed_file(path: Path) -> dict:
         }
 
 
-def load_previous_iteration(workspace: Path) -> dict[str, dict]:
+def validate_review(review: object) -> None:
+    """Raise ValueError unless review has a string run_id and, if any, a string timestamp."""
+    if not isinstance(review, dict) or not isinstance(review.get("run_id"), str):
+        raise ValueError("Each review needs a string 'run_id'")
+    if review.get("timestamp") is not None and not isinstance(review["timestamp"], str):
+        raise ValueError("A review's 'timestamp' must be a string")
+
+
+def merge_reviews(merged: dict[str, dict], reviews: list[dict]) -> None:
+    """Fold reviews into merged (run_id -> review); per run, the last writer wins.
+
+    "Last" is by timestamp, then by order of writing; a review without a
+    timestamp always wins. Replaying a review that is already merged
+    changes nothing. Malformed reviews (see validate_review), e.g. from a
+    hand-edited feedback.json, are skipped.
+    """
+    for review in reviews:
+        try:
+            validate_review(review)
+        except ValueError:
+            continue
+        current = merged.get(review["run_id"])
+        if current is None or not review.get("timestamp") or review["timestamp"] >= (current.get("timestamp") or ""):
+            merged[review["run_id"]] = review
+
+
+class FeedbackJournal:
+    """feedback.json plus an append-only journal of the saves made since.
+
+    Saves append one JSON line to the journal and never rewrite
+    feedback.json, so a save costs one small write, and a crash can at
+    worst leave a torn last line, which is skipped. compact() merges the
+    journal into feedback.json (written to a temp file, then renamed over
+    it) and deletes the journal; a crash in between only means some entries
+    are merged twice, which merge_reviews makes harmless. Each run keeps its
+    latest review, so two tabs saving different runs do not overwrite each
+    other.
+    """
+
+    def __init__(self, path: Path, compact_every: int = COMPACT_EVERY):
+        self.path = path
+        self.journal_path = path.with_name(FEEDBACK_JOURNAL_NAME)
+        self.compact_every = compact_every
+        self._appended = 0
+        self._lock = threading.Lock()
+
+    def _read_state(self) -> tuple[dict[str, dict], str | None, int]:
+        """Merged reviews, latest status, and the number of journal entries."""
+        merged: dict[str, dict] = {}
+        status = None
+        try:
+            data = json.loads(self.path.read_text())
+            merge_reviews(merged, data.get("reviews", []))
+            status = data.get("status")
+        except (OSError, json.JSONDecodeError, AttributeError, KeyError, TypeError):
+            pass
+
+        entries = 0
+        try:
+            with self.journal_path.open() as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash
+                        continue
+                    merge_reviews(merged, entry["reviews"])
+                    status = entry.get("status", status)
+                    entries += 1
+        except OSError:
+            pass
+        return merged, status, entries
+
+    @staticmethod
+    def _view(merged: dict[str, dict], status: str | None) -> dict:
+        data: dict = {"reviews": list(merged.values())}
+        if status:
+            data["status"] = status
+        return data
+
+    def read(self) -> dict:
+        """The compacted view: feedback.json with the journal merged in."""
+        with self._lock:
+            merged, status, _ = self._read_state()
+        return self._view(merged, status)
+
+    def append(self, data: dict) -> None:
+        """Record a save of {"reviews": [...], "status": ...}.
+
+        Submitting (status "complete") compacts right away, so feedback.json
+        is complete for whoever reads it next.
+        """
+        for review in data["reviews"]:
+            validate_review(review)
+        entry = {"reviews": data["reviews"]}
+        if data.get("status"):
+            entry["status"] = data["status"]
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+
+        with self._lock:
+            # One write on an O_APPEND descriptor: lines never interleave
+            fd = os.open(self.journal_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    # End a line torn by a crash, or this entry would be lost with it
+                    line = b"\n" + line
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._appended += 1
+            if data.get("status") == "complete" or self._appended >= self.compact_every:
+                self._compact()
+
+    def compact(self) -> None:
+        """Merge the journal into feedback.json, if there is anything to merge."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        merged, status, entries = self._read_state()
+        self._appended = 0
+        if entries == 0:
+            self.journal_path.unlink(missing_ok=True)
+            return
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp.open("w") as f:
+            f.write(json.dumps(self._view(merged, status), indent=2) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.journal_path.unlink(missing_ok=True)
+
+
+def load_previous_iteration(
+    workspace: Path,
+    inline: bool = True,
+    file_url: str = "/api/file",
+    index: WorkspaceIndex | None = None,
+) -> dict[str, dict]:
     """Load previous iteration's feedback and outputs.
 
+    Pass the server's index for the workspace to share its parsed runs.
+
     Returns a map of run_id -> {"feedback": str, "outputs": list[dict]}.
     """
     result: dict[str, dict] = {}
 
-    # Load feedback
-    feedback_map: dict[str, str] = {}
-    feedback_path = workspace / "feedback.json"
-    if feedback_path.exists():
-        try:
-            data = json.loads(feedback_path.read_text())
-            feedback_map = {
-                r["run_id"]: r["feedback"]
-                for r in data.get("reviews", [])
-                if r.get("feedback", "").strip()
-            }
-        except (json.JSONDecodeError, OSError, KeyError):
-            pass
+    # Load feedback, including saves not yet compacted into feedback.json
+    data = FeedbackJournal(workspace / "feedback.json").read()
+    feedback_map: dict[str, str] = {
+        r["run_id"]: r["feedback"]
+        for r in data["reviews"]
+        if isinstance(r.get("feedback"), str) and r["feedback"].strip()
+    }
 
     # Load runs (to get outputs)
-    prev_runs = find_runs(workspace)
+    prev_runs = (index or WorkspaceIndex(workspace, inline, file_url)).runs()
     for run in prev_runs:
         result[run["id"]] = {
             "feedback": feedback_map.get(run["id"], ""),
@@ -252,8 +669,13 @@ def generate_html(
     skill_name: str,
     previous: dict[str, dict] | None = None,
     benchmark: dict | None = None,
+    live: bool = False,
 ) -> str:
-    """Generate the complete standalone HTML page with embedded data."""
+    """Generate the complete standalone HTML page with embedded data.
+
+    A live page (served) embeds no runs: the viewer pages them in from
+    /api/runs and then follows /api/events.
+    """
     template_path = Path(__file__).parent / "viewer.html"
     template = template_path.read_text()
 
@@ -269,6 +691,7 @@ def generate_html(
 
     embedded = {
         "skill_name": skill_name,
+        "live": live,
         "runs": runs,
         "previous_feedback": previous_feedback,
         "previous_outputs": previous_outputs,
@@ -285,6 +708,10 @@ def generate_html(
 # HTTP server (stdlib only, zero dependencies)
 # ---------------------------------------------------------------------------
 
+def _exit_on_signal(signum, frame) -> None:
+    raise SystemExit(128 + signum)
+
+
 def _kill_port(port: int) -> None:
     """Kill any process listening on the given port."""
     try:
@@ -305,58 +732,350 @@ def _kill_port(port: int) -> None:
     except FileNotFoundError:
         print("Note: lsof not found, cannot check if port is in use", file=sys.stderr)
 
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range "bytes=start-end" header into inclusive offsets.
+
+    Returns None for a range that cannot be satisfied; raises ValueError for
+    one that cannot be parsed (or asks for several ranges), which callers
+    answer with the whole file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        raise ValueError(header)
+    start_s, _, end_s = spec.strip().partition("-")
+    if not start_s:
+        # Suffix range: the last N bytes
+        length = int(end_s)
+        if length <= 0 or size == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(start_s)
+    end = int(end_s) if end_s else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick "br" (if brotli is installed) or "gzip" from an Accept-Encoding header."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def representation_etag(etag: str, encoding: str | None) -> str:
+    """Strong ETag of one content coding of a body: '"abc"' -> '"abc-gzip"'.
+
+    The gzip, brotli and identity bytes differ, so they must not share a
+    strong validator (RFC 9110, section 8.8.3).
+    """
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+class _Compressor:
+    """Incremental gzip or brotli compression with one interface."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._impl = brotli.Compressor(quality=5)
+            self.compress, self.flush = self._impl.process, self._impl.finish
+        else:
+            self._impl = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31: gzip container
+            self.compress, self.flush = self._impl.compress, self._impl.flush
+
+
 class ReviewHandler(BaseHTTPRequestHandler):
-    """Serves the review HTML and handles feedback saves.
+    """Serves the review HTML, output files, and handles feedback saves.
 
     Regenerates the HTML on each page load so that refreshing the browser
-    picks up new eval outputs without restarting the server.
+    picks up new eval outputs without restarting the server. The page only
+    lists output files; their bodies are served from /api/file/<run_id>/<name>
+    (and /api/file/previous/<run_id>/<name> for the previous workspace).
+
+    Speaks HTTP/1.1, so connections are kept alive between requests; every
+    response therefore has a Content-Length or is sent chunked.
     """
 
+    protocol_version = "HTTP/1.1"
+
     def __init__(
         self,
         workspace: Path,
         skill_name: str,
-        feedback_path: Path,
+        feedback: FeedbackJournal,
         previous: dict[str, dict],
         benchmark_path: Path | None,
+        index: WorkspaceIndex,
+        previous_index: WorkspaceIndex | None,
         *args,
         **kwargs,
     ):
         self.workspace = workspace
         self.skill_name = skill_name
-        self.feedback_path = feedback_path
+        self.feedback = feedback
         self.previous = previous
         self.benchmark_path = benchmark_path
+        # Shared across requests, so only changed runs are re-read
+        self.index = index
+        self.previous_index = previous_index
         super().__init__(*args, **kwargs)
 
     def do_GET(self) -> None:
-        if self.path == "/" or self.path == "/index.html":
-            # Regenerate HTML on each request (re-scans workspace for new outputs)
-            runs = find_runs(self.workspace)
+        route = urlsplit(self.path).path
+        if self.path.startswith("/api/file/"):
+            self._serve_file()
+        elif route == "/api/runs":
+            self._serve_runs()
+        elif route == "/api/events":
+            self._serve_events()
+        elif self.path == "/" or self.path == "/index.html":
+            # Regenerate HTML on each request; runs are loaded by the page
+            # from /api/runs, so this does not touch the workspace
             benchmark = None
             if self.benchmark_path and self.benchmark_path.exists():
                 try:
                     benchmark = json.loads(self.benchmark_path.read_text())
                 except (json.JSONDecodeError, OSError):
                     pass
-            html = generate_html(runs, self.skill_name, self.previous, benchmark)
-            content = html.encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Content-Length", str(len(content)))
-            self.end_headers()
-            self.wfile.write(content)
+            html = generate_html([], self.skill_name, self.previous, benchmark, live=True)
+            self._send_body(html.encode("utf-8"), "text/html; charset=utf-8")
         elif self.path == "/api/feedback":
-            data = b"{}"
-            if self.feedback_path.exists():
-                data = self.feedback_path.read_bytes()
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
+            data = json.dumps(self.feedback.read()).encode("utf-8")
+            self._send_body(data, "application/json")
+        else:
+            self.send_error(404)
+
+    def _etag_matches(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+        return "*" in tags or etag in tags
+
+    def _send_not_modified(self, etag: str, vary: bool = False) -> None:
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        if vary:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def _send_body(self, data: bytes, content_type: str, etag: str | None = None) -> None:
+        """Send an HTML/JSON body with an ETag, compressed if the client accepts it.
+
+        etag defaults to a hash of data, and is suffixed with the negotiated
+        encoding (see representation_etag). Large bodies are compressed and
+        written in chunks rather than compressed into memory first.
+        """
+        encoding = negotiate_encoding(self.headers.get("Accept-Encoding", ""))
+        etag = representation_etag(etag or f'"{hashlib.sha256(data).hexdigest()[:16]}"', encoding)
+        if self._etag_matches(etag):
+            self._send_not_modified(etag, vary=True)
+            return
+
+        if len(data) < MIN_COMPRESS_BYTES:
+            encoding = None
+        streamed = encoding is not None and len(data) > STREAM_THRESHOLD_BYTES
+        if encoding and not streamed:
+            compressor = _Compressor(encoding)
+            data = compressor.compress(data) + compressor.flush()
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if streamed:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
             self.send_header("Content-Length", str(len(data)))
-            self.end_headers()
+        self.end_headers()
+
+        if not streamed:
             self.wfile.write(data)
-        else:
+            return
+        compressor = _Compressor(encoding)
+        for start in range(0, len(data), CHUNK_SIZE):
+            self._write_chunk(compressor.compress(data[start:start + CHUNK_SIZE]))
+        self._write_chunk(compressor.flush())
+        self._end_chunks()
+
+    def _write_chunk(self, data: bytes) -> None:
+        # An empty chunk would end the body
+        if data:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def _end_chunks(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _serve_runs(self) -> None:
+        """One page of runs: /api/runs?offset=&limit=&eval_id=, plus the total and event cursor."""
+        query = parse_qs(urlsplit(self.path).query)
+        try:
+            offset = max(0, int(query.get("offset", ["0"])[0]))
+            limit = max(1, int(query.get("limit", [str(DEFAULT_RUNS_PAGE_SIZE)])[0]))
+        except ValueError:
+            self.send_error(400, "offset and limit must be integers")
+            return
+        eval_id = query.get("eval_id", [None])[0]
+        seq, runs = self.index.snapshot()
+        # The index version identifies the content, so an unchanged page is
+        # answered without serializing it
+        version = hashlib.sha256(f"{offset}:{limit}:{eval_id}".encode("utf-8")).hexdigest()[:8]
+        etag = f'"{self.index.cursor(seq)}-{version}"'
+        encoded_etag = representation_etag(etag, negotiate_encoding(self.headers.get("Accept-Encoding", "")))
+        if self._etag_matches(encoded_etag):
+            self._send_not_modified(encoded_etag, vary=True)
+            return
+        if eval_id is not None:
+            runs = [run for run in runs if str(run["eval_id"]) == eval_id]
+        data = json.dumps({
+            "cursor": self.index.cursor(seq),
+            "total": len(runs),
+            "offset": offset,
+            "limit": limit,
+            "runs": runs[offset:offset + limit],
+        }).encode("utf-8")
+        self._send_body(data, "application/json", etag)
+
+    def _serve_events(self) -> None:
+        """Server-Sent Events stream of run changes after the cursor in ?since= (or Last-Event-ID)."""
+        query = parse_qs(urlsplit(self.path).query)
+        cursor = self.headers.get("Last-Event-ID") or query.get("since", [None])[0]
+        try:
+            epoch, seq = parse_cursor(cursor) if cursor else (self.index.epoch, 0)
+        except ValueError:
+            self.send_error(400, "since must be a cursor from /api/runs")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            while True:
+                events = self.index.events_since(epoch, seq, SSE_HEARTBEAT_SECONDS)
+                if events is None:
+                    self._write_chunk(b"event: reset\ndata: {}\n\n")
+                    self._end_chunks()
+                    return
+                if not events:
+                    self._write_chunk(b": keepalive\n\n")
+                for seq, event in events:
+                    payload = event["run"] if event["type"] == "run" else {"id": event["id"]}
+                    self._write_chunk(f"id: {self.index.cursor(seq)}\nevent: {event['type']}\ndata: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _resolve_output(self, run_id: str, name: str, previous: bool) -> Path | None:
+        """Find an output file by run id and name, refusing anything outside outputs/."""
+        index = self.previous_index if previous else self.index
+        if index is None or not name or "/" in name or "\\" in name or name in (".", ".."):
+            return None
+        run_dir = index.get_run_dir(run_id)
+        if run_dir is None or name in METADATA_FILES:
+            return None
+        path = run_dir / "outputs" / name
+        return path if path.is_file() else None
+
+    def _serve_file(self) -> None:
+        url = urlsplit(self.path)
+        parts = url.path[len("/api/file/"):].split("/")
+        previous = len(parts) == 3 and parts[0] == "previous"
+        if previous:
+            parts = parts[1:]
+        if len(parts) != 2:
             self.send_error(404)
+            return
+        path = self._resolve_output(unquote(parts[0]), unquote(parts[1]), previous)
+        if path is None:
+            self.send_error(404)
+            return
+
+        try:
+            stat = path.stat()
+            etag = f'"{file_hash(path, stat)}"'
+        except OSError:
+            self.send_error(404)
+            return
+        size = stat.st_size
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+        if self._etag_matches(etag) or self._not_modified_since(stat.st_mtime):
+            self._send_not_modified(etag)
+            return
+
+        start, end, status = 0, size - 1, 200
+        range_header = self.headers.get("Range")
+        # If-Range: only honor the range if the client's copy is current
+        if range_header and self.headers.get("If-Range", etag) in (etag, last_modified):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                byte_range = (0, size - 1)
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range
+            status = 206 if byte_range != (0, size - 1) else 200
+
+        self.send_response(status)
+        self.send_header("Content-Type", get_mime_type(path))
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        # URLs carry the content hash (?v=), so a URL's body never changes
+        if "v" in parse_qs(url.query):
+            self.send_header("Cache-Control", "private, max-age=31536000, immutable")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+
+        remaining = end - start + 1
+        try:
+            with path.open("rb") as f:
+                f.seek(start)
+                while remaining > 0:
+                    chunk = f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        # File shrank: the promised length cannot be met
+                        self.close_connection = True
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # Browsers drop PDF and media requests once they have enough
+            self.close_connection = True
+
+    def _not_modified_since(self, mtime: float) -> bool:
+        header = self.headers.get("If-Modified-Since")
+        if not header or self.headers.get("If-None-Match"):
+            return False
+        try:
+            return int(mtime) <= parsedate_to_datetime(header).timestamp()
+        except (TypeError, ValueError):
+            return False
 
     def do_POST(self) -> None:
         if self.path == "/api/feedback":
@@ -364,9 +1083,9 @@ class ReviewHandler(BaseHTTPRequestHandler):
             body = self.rfile.read(length)
             try:
                 data = json.loads(body)
-                if not isinstance(data, dict) or "reviews" not in data:
+                if not isinstance(data, dict) or not isinstance(data.get("reviews"), list):
                     raise ValueError("Expected JSON object with 'reviews' key")
-                self.feedback_path.write_text(json.dumps(data, indent=2) + "\n")
+                self.feedback.append(data)
                 resp = b'{"ok":true}'
                 self.send_response(200)
             except (json.JSONDecodeError, OSError, ValueError) as e:
@@ -401,6 +1120,10 @@ def main() -> None:
         "--static", "-s", type=Path, default=None,
         help="Write standalone HTML to this path instead of starting a server",
     )
+    parser.add_argument(
+        "--watch-interval", type=float, default=2.0,
+        help="Seconds between workspace checks for live updates; 0 disables them (default: 2)",
+    )
     args = parser.parse_args()
 
     workspace = args.workspace.resolve()
@@ -408,7 +1131,8 @@ def main() -> None:
         print(f"Error: {workspace} is not a directory", file=sys.stderr)
         sys.exit(1)
 
-    runs = find_runs(workspace)
+    index = WorkspaceIndex(workspace, inline=bool(args.static))
+    runs = index.runs()
     if not runs:
         print(f"No runs found in {workspace}", file=sys.stderr)
         sys.exit(1)
@@ -416,9 +1140,13 @@ def main() -> None:
     skill_name = args.skill_name or workspace.name.replace("-workspace", "")
     feedback_path = workspace / "feedback.json"
 
+    previous_workspace = args.previous_workspace.resolve() if args.previous_workspace else None
+    previous_index = None
     previous: dict[str, dict] = {}
-    if args.previous_workspace:
-        previous = load_previous_iteration(args.previous_workspace.resolve())
+    if previous_workspace:
+        # The server streams previous outputs too; only --static embeds them
+        previous_index = WorkspaceIndex(previous_workspace, inline=bool(args.static), file_url="/api/file/previous")
+        previous = load_previous_iteration(previous_workspace, index=previous_index)
 
     benchmark_path = args.benchmark.resolve() if args.benchmark else None
     benchmark = None
@@ -435,15 +1163,21 @@ def main() -> None:
         print(f"\n  Static viewer written to: {args.static}\n")
         sys.exit(0)
 
+    feedback = FeedbackJournal(feedback_path)
+    # Fold in saves left over from a server that did not shut down cleanly
+    feedback.compact()
+
     # Kill any existing process on the target port
     port = args.port
     _kill_port(port)
-    handler = partial(ReviewHandler, workspace, skill_name, feedback_path, previous, benchmark_path)
+    handler = partial(
+        ReviewHandler, workspace, skill_name, feedback, previous, benchmark_path, index, previous_index,
+    )
     try:
-        server = HTTPServer(("127.0.0.1", port), handler)
+        server = ThreadingHTTPServer(("127.0.0.1", port), handler)
     except OSError:
         # Port still in use after kill attempt — find a free one
-        server = HTTPServer(("127.0.0.1", 0), handler)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
         port = server.server_address[1]
 
     url = f"http://localhost:{port}"
@@ -458,13 +1192,21 @@ def main() -> None:
         print(f"  Benchmark: {benchmark_path}")
     print(f"\n  Press Ctrl+C to stop.\n")
 
+    if args.watch_interval > 0:
+        index.watch(args.watch_interval)
+
     webbrowser.open(url)
 
+    # Shut down through the finally below on SIGTERM too (e.g. from
+    # _kill_port in a newer viewer), so pending saves are compacted
+    signal.signal(signal.SIGTERM, _exit_on_signal)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nStopped.")
+    finally:
         server.server_close()
+        feedback.compact()
 
 
 if __name__ == "__main__":
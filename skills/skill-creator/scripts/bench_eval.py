@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Benchmark trigger detection and the run_eval engine offline.
+
+Uses replay fixtures (see replay_claude.py) instead of a live `claude`
+binary, so regressions in the eval engine can be caught without API access.
+Measures:
+
+- parser: lines/sec and MB/sec through StreamJsonParser + TriggerDetector,
+  next to the naive split-and-decode-everything loop for reference
+- decision: time from spawning a replayed `claude -p` to a trigger decision
+- workers: wall time and per-run overhead of run_eval at several
+  --num-workers settings
+
+Without --fixtures, synthetic fixtures are generated in a temp directory.
+
+Usage:
+    python -m scripts.bench_eval [--fixtures DIR] [--workers 1,10,100,500] [--queries 200]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.replay_claude import COMMAND_PLACEHOLDER, StreamRecorder, load_fixtures
+from scripts.run_eval import READ_CHUNK_SIZE, format_timing, run_eval_async, run_query_timed, summarize_runs
+from scripts.stream_parser import StreamJsonParser, TriggerDetector
+
+BENCH_SKILL_NAME = "bench"
+REPLAY_BIN = Path(__file__).parent / "replay_claude.py"
+
+
+def synthesize_fixtures(fixture_dir: Path, queries: int, text_kb: int) -> list[dict]:
+    """Write one fixture per query; odd queries trigger, even ones answer in text."""
+    eval_set = []
+    for i in range(queries):
+        query = f"bench query {i}"
+        should_trigger = i % 2 == 1
+        recorder = StreamRecorder(query, COMMAND_PLACEHOLDER)
+        events = [{"type": "system", "subtype": "init"}]
+        events.append({"type": "stream_event", "event": {"type": "message_start", "message": {"role": "assistant"}}})
+        if should_trigger:
+            events.append({"type": "stream_event", "event": {"type": "content_block_start", "index": 0, "content_block": {"type": "tool_use", "name": "Skill"}}})
+            for part in ['{"skill": "', COMMAND_PLACEHOLDER, '"}']:
+                events.append({"type": "stream_event", "event": {"type": "content_block_delta", "delta": {"type": "input_json_delta", "partial_json": part}}})
+            events.append({"type": "stream_event", "event": {"type": "content_block_stop", "index": 0}})
+        else:
+            events.append({"type": "stream_event", "event": {"type": "content_block_start", "index": 0, "content_block": {"type": "text"}}})
+            for _ in range(text_kb):
+                events.append({"type": "stream_event", "event": {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "lorem ipsum " * 85}}})
+            events.append({"type": "stream_event", "event": {"type": "content_block_stop", "index": 0}})
+            events.append({"type": "stream_event", "event": {"type": "message_stop"}})
+        events.append({"type": "result", "subtype": "success", "is_error": False})
+        for n, event in enumerate(events):
+            recorder.lines.append((round(n * 0.01, 4), json.dumps(event)))
+        recorder.save(fixture_dir, should_trigger)
+        eval_set.append({"query": query, "should_trigger": should_trigger})
+    return eval_set
+
+
+def eval_set_from_fixtures(fixtures: list[dict]) -> list[dict]:
+    """Label each recorded query by majority vote over its decided fixtures.
+
+    Fixtures whose run reached no decision ("triggered" is None: timed out
+    or cut short) say nothing about the expected outcome and are ignored;
+    queries with no decided fixture are left out. Ties count as triggering.
+    """
+    votes: dict[str, list[bool]] = {}
+    for fixture in fixtures:
+        if fixture.get("triggered") is None:
+            continue
+        votes.setdefault(fixture["query"], []).append(bool(fixture["triggered"]))
+    return [
+        {"query": query, "should_trigger": 2 * sum(triggers) >= len(triggers)}
+        for query, triggers in votes.items()
+    ]
+
+
+def _stream_bytes(fixture: dict, command_name: str) -> bytes:
+    return b"".join(
+        text.replace(COMMAND_PLACEHOLDER, command_name).encode("utf-8") + b"\n"
+        for _, text in fixture["lines"]
+    )
+
+
+def _naive_detect(data: bytes, command_name: str) -> None:
+    """The pre-StreamJsonParser read loop: str buffer, split per line, decode every line."""
+    buffer = ""
+    for start in range(0, len(data), READ_CHUNK_SIZE):
+        buffer += data[start:start + READ_CHUNK_SIZE].decode("utf-8", errors="replace")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line = line.strip()
+            if line:
+                try:
+                    json.loads(line)
+                except json.JSONDecodeError:
+                    pass
+
+
+def bench_parser(fixtures: list[dict], repeat: int) -> dict:
+    command_name = f"{BENCH_SKILL_NAME}-skill-00000000"
+    streams = [_stream_bytes(f, command_name) for f in fixtures]
+    total_bytes = sum(len(s) for s in streams) * repeat
+    total_lines = sum(len(f["lines"]) for f in fixtures) * repeat
+
+    decoded = 0
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for data in streams:
+            parser = StreamJsonParser()
+            detector = TriggerDetector(command_name)
+            # Feed the whole stream, without stopping at the decision, so the
+            # numbers measure parsing rather than how early fixtures decide
+            for start in range(0, len(data), READ_CHUNK_SIZE):
+                for event in parser.feed(data[start:start + READ_CHUNK_SIZE]):
+                    detector.process(event)
+            parser.flush()
+            decoded += parser.lines_decoded
+    parser_elapsed = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for data in streams:
+            _naive_detect(data, command_name)
+    naive_elapsed = time.perf_counter() - t0
+
+    return {
+        "lines": total_lines,
+        "bytes": total_bytes,
+        "lines_decoded": decoded,
+        "elapsed_s": parser_elapsed,
+        "lines_per_s": total_lines / parser_elapsed if parser_elapsed else 0.0,
+        "mb_per_s": total_bytes / parser_elapsed / 1e6 if parser_elapsed else 0.0,
+        "naive_elapsed_s": naive_elapsed,
+        "speedup_vs_naive": naive_elapsed / parser_elapsed if parser_elapsed else 0.0,
+    }
+
+
+async def bench_decision(eval_set: list[dict], project_root: Path, samples: int) -> dict:
+    """Time sequential replayed runs from spawn to decision."""
+    records = []
+    for item in eval_set[:samples]:
+        records.append(await run_query_timed(
+            item["query"], BENCH_SKILL_NAME, "Benchmark skill", 30, str(project_root),
+            claude_bin=str(REPLAY_BIN),
+        ))
+    return summarize_runs(records)
+
+
+async def bench_workers(eval_set: list[dict], project_root: Path, workers: int, runs_per_query: int) -> dict:
+    t0 = time.perf_counter()
+    output = await run_eval_async(
+        eval_set=eval_set,
+        skill_name=BENCH_SKILL_NAME,
+        description="Benchmark skill",
+        num_workers=workers,
+        timeout=60,
+        project_root=project_root,
+        runs_per_query=runs_per_query,
+        claude_bin=str(REPLAY_BIN),
+    )
+    elapsed = time.perf_counter() - t0
+    runs = sum(r["runs"] for r in output["results"])
+    return {
+        "workers": workers,
+        "runs": runs,
+        "elapsed_s": elapsed,
+        "runs_per_s": runs / elapsed if elapsed else 0.0,
+        # Wall time each worker slot spent per run; flat as workers grow means no engine contention
+        "overhead_per_run_s": elapsed * min(workers, runs) / runs if runs else 0.0,
+        "passed": output["summary"]["passed"],
+        "total": output["summary"]["total"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark trigger detection and run_eval offline")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Fixture directory from run_eval.py --record-dir (default: synthesize)")
+    parser.add_argument("--queries", type=int, default=200, help="Synthetic queries to generate")
+    parser.add_argument("--text-kb", type=int, default=64, help="Approximate KB of text deltas per non-triggering synthetic stream")
+    parser.add_argument("--workers", default="1,10,50,100,500", help="Comma-separated --num-workers values to sweep")
+    parser.add_argument("--runs-per-query", type=int, default=1, help="Runs per query in the worker sweep")
+    parser.add_argument("--parser-repeat", type=int, default=5, help="Passes over the fixtures in the parser benchmark")
+    parser.add_argument("--decision-samples", type=int, default=20, help="Sequential runs timed in the decision benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="Replay latency multiplier (0 = as fast as possible)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_eval_") as tmp:
+        tmp_path = Path(tmp)
+        if args.fixtures:
+            fixture_dir = args.fixtures.resolve()
+            fixtures = load_fixtures(fixture_dir)
+            eval_set = eval_set_from_fixtures(fixtures)
+        else:
+            fixture_dir = tmp_path / "fixtures"
+            eval_set = synthesize_fixtures(fixture_dir, args.queries, args.text_kb)
+            fixtures = load_fixtures(fixture_dir)
+
+        if not fixtures:
+            print(f"Error: no fixtures found in {fixture_dir}", file=sys.stderr)
+            sys.exit(1)
+        if not eval_set:
+            print(f"Error: no fixture in {fixture_dir} recorded a decision", file=sys.stderr)
+            sys.exit(1)
+
+        os.environ["CLAUDE_REPLAY_DIR"] = str(fixture_dir)
+        os.environ["CLAUDE_REPLAY_LATENCY"] = str(args.latency)
+        project_root = tmp_path / "project"
+        (project_root / ".claude").mkdir(parents=True)
+
+        print(f"Parser: {len(fixtures)} fixtures x {args.parser_repeat}", file=sys.stderr)
+        results = {"parser": bench_parser(fixtures, args.parser_repeat)}
+        p = results["parser"]
+        print(f"  {p['lines_per_s']:,.0f} lines/s, {p['mb_per_s']:.1f} MB/s, {p['speedup_vs_naive']:.1f}x vs naive", file=sys.stderr)
+
+        print(f"Decision: {args.decision_samples} sequential runs", file=sys.stderr)
+        results["decision"] = asyncio.run(bench_decision(eval_set, project_root, args.decision_samples))
+        print(f"  {format_timing(results['decision'])}", file=sys.stderr)
+
+        results["workers"] = []
+        for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+            r = asyncio.run(bench_workers(eval_set, project_root, workers, args.runs_per_query))
+            results["workers"].append(r)
+            print(f"Workers {workers:>4}: {r['runs']} runs in {r['elapsed_s']:.2f}s ({r['runs_per_s']:.1f} runs/s, {r['overhead_per_run_s']:.3f}s/run/slot)", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
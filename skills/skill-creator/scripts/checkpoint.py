@@ -0,0 +1,151 @@
+"""Crash-safe checkpoints for run_loop.py.
+
+A results directory holds three files, all written as work completes:
+
+- checkpoint.json: the settings the run was started with, so a resume can
+  refuse to continue with an incompatible eval set or configuration
+- runs.jsonl: one line per finished `claude -p` run, keyed like the trigger
+  cache by (query, description, model) plus the run index
+- iterations.jsonl: one line per finished iteration with its history entry
+  and the description the next iteration should evaluate
+
+Both .jsonl files are append-only, so a crash can at worst leave a torn final
+line, which is ignored on load. RunCheckpoint implements the TriggerCache
+get_runs/put_run interface, so run_eval skips any run already journaled
+without knowing about checkpoints.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from scripts.trigger_cache import TriggerCache
+
+CHECKPOINT_VERSION = 1
+
+
+def eval_set_hash(eval_set: list[dict]) -> str:
+    payload = json.dumps(eval_set, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    """Read a JSONL file, skipping lines that do not parse (e.g. torn by a crash)."""
+    if not path.exists():
+        return []
+    records = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+class RunCheckpoint:
+    """Append-only journal of runs and iterations in a results directory.
+
+    Wraps an optional TriggerCache: runs are looked up in the journal first,
+    then in the cache, and every result either produces is journaled so a
+    resume never depends on cache expiry.
+    """
+
+    RUNS_FILE = "runs.jsonl"
+    ITERATIONS_FILE = "iterations.jsonl"
+    META_FILE = "checkpoint.json"
+
+    def __init__(self, results_dir: Path, cache: TriggerCache | None = None):
+        self.results_dir = Path(results_dir)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._runs: dict[str, dict[int, bool]] = {}
+        for record in read_jsonl(self.results_dir / self.RUNS_FILE):
+            self._runs.setdefault(record["key"], {})[record["run_idx"]] = record["triggered"]
+        self._runs_file = self._open_for_append(self.RUNS_FILE)
+        self._iterations_file = self._open_for_append(self.ITERATIONS_FILE)
+
+    def __enter__(self) -> "RunCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _open_for_append(self, name: str):
+        path = self.results_dir / name
+        # Start on a fresh line if the previous process died mid-write
+        if path.exists() and path.stat().st_size and not path.read_bytes().endswith(b"\n"):
+            with path.open("ab") as f:
+                f.write(b"\n")
+        return path.open("a", encoding="utf-8")
+
+    def _append(self, f, record: dict) -> None:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+
+    def check_meta(self, meta: dict) -> None:
+        """Record the run settings, or raise ValueError if they differ from the checkpoint's."""
+        path = self.results_dir / self.META_FILE
+        meta = {"version": CHECKPOINT_VERSION, **meta}
+        if not path.exists():
+            path.write_text(json.dumps(meta, indent=2))
+            return
+        saved = json.loads(path.read_text())
+        mismatched = sorted(k for k in set(saved) | set(meta) if saved.get(k) != meta.get(k))
+        if mismatched:
+            raise ValueError(f"checkpoint in {self.results_dir} was created with different settings: {', '.join(mismatched)}")
+
+    # TriggerCache interface, called from run_eval
+
+    def get_runs(self, key: str, runs: int) -> dict[int, bool]:
+        with self._lock:
+            found = {i: t for i, t in self._runs.get(key, {}).items() if i < runs}
+        self.hits += len(found)
+        if self.cache is not None and len(found) < runs:
+            for run_idx, triggered in self.cache.get_runs(key, runs).items():
+                if run_idx not in found:
+                    found[run_idx] = triggered
+                    self._journal_run(key, run_idx, triggered)
+        return found
+
+    def record_miss(self) -> None:
+        self.misses += 1
+        if self.cache is not None:
+            self.cache.record_miss()
+
+    def put_run(self, key: str, run_idx: int, triggered: bool) -> None:
+        self._journal_run(key, run_idx, triggered)
+        if self.cache is not None:
+            self.cache.put_run(key, run_idx, triggered)
+
+    def _journal_run(self, key: str, run_idx: int, triggered: bool) -> None:
+        with self._lock:
+            self._runs.setdefault(key, {})[run_idx] = triggered
+            self._append(self._runs_file, {"key": key, "run_idx": run_idx, "triggered": triggered})
+
+    # Iteration state, called from run_loop
+
+    def load_iterations(self) -> list[dict]:
+        """Completed iterations in order, one record per iteration number (latest wins)."""
+        by_iteration = {r["iteration"]: r for r in read_jsonl(self.results_dir / self.ITERATIONS_FILE)}
+        return [by_iteration[i] for i in sorted(by_iteration)]
+
+    def record_iteration(self, entry: dict, next_description: str | None, exit_reason: str) -> None:
+        with self._lock:
+            self._append(self._iterations_file, {
+                "iteration": entry["iteration"],
+                "entry": entry,
+                "next_description": next_description,
+                "exit_reason": exit_reason,
+            })
+
+    def close(self) -> None:
+        with self._lock:
+            self._runs_file.close()
+            self._iterations_file.close()
+        if self.cache is not None:
+            self.cache.close()
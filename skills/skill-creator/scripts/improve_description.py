@@ -13,8 +13,41 @@ from pathlib import Path
 
 import anthropic
 
+from scripts.rate_limit import RateGovernor, call_with_backoff
 from scripts.utils import parse_skill_md
 
+# Beam candidates are proposed concurrently from the same results, so each
+# one is steered toward a different kind of rewrite (see improve_description)
+CANDIDATE_FOCUSES = (
+    "Keep whatever already works in the current description and make the smallest changes that fix the failures above.",
+    "Favor recall: make sure every kind of request that should trigger the skill is clearly covered, even at the cost of a few false triggers.",
+    "Favor precision: draw a sharp boundary so that requests which merely sound similar, or belong to other tools, do not trigger the skill.",
+    "Start from scratch with a structurally different description: a different opening, ordering and wording from the current one and every previous attempt.",
+)
+
+
+def timed_out_note(result: dict) -> str:
+    """", N timed out" for a query result with timed-out runs, else "".
+
+    Timed-out runs are not part of "runs", so without the note a query whose
+    runs all timed out would read as "triggered 0/0", i.e. as a description
+    that never triggers rather than a slow one.
+    """
+    return f', {result["timed_out"]} timed out' if result.get("timed_out") else ""
+
+
+def create_message(client: anthropic.Anthropic, governor: RateGovernor | None, **kwargs):
+    """client.messages.create, through the governor when there is one."""
+    if governor is None:
+        return client.messages.create(**kwargs)
+    # Rough upper bound for the token bucket: ~4 characters per prompt token
+    prompt_chars = sum(len(str(m["content"])) for m in kwargs["messages"])
+    return call_with_backoff(
+        governor,
+        lambda: client.messages.create(**kwargs),
+        estimated_tokens=kwargs["max_tokens"] + prompt_chars // 4,
+    )
+
 
 def improve_description(
     client: anthropic.Anthropic,
@@ -27,8 +60,19 @@ def improve_description(
     test_results: dict | None = None,
     log_dir: Path | None = None,
     iteration: int | None = None,
+    candidate: int | None = None,
+    governor: RateGovernor | None = None,
 ) -> str:
-    """Call Claude to improve the description based on eval results."""
+    """Call Claude to improve the description based on eval results.
+
+    `candidate` numbers concurrent proposals for the same iteration (from 1);
+    each candidate gets its own entry of CANDIDATE_FOCUSES appended to the
+    prompt, so a beam explores different rewrites instead of sampling the
+    same prompt several times.
+
+    Pass a governor shared by concurrent callers to rate limit the API calls
+    and retry them when throttled.
+    """
     failed_triggers = [
         r for r in eval_results["results"]
         if r["should_trigger"] and not r["pass"]
@@ -61,13 +105,13 @@ Current scores ({scores_summary}):
     if failed_triggers:
         prompt += "FAILED TO TRIGGER (should have triggered but didn't):\n"
         for r in failed_triggers:
-            prompt += f'  - "{r["query"]}" (triggered {r["triggers"]}/{r["runs"]} times)\n'
+            prompt += f'  - "{r["query"]}" (triggered {r["triggers"]}/{r["runs"]} times{timed_out_note(r)})\n'
         prompt += "\n"
 
     if false_triggers:
         prompt += "FALSE TRIGGERS (triggered but shouldn't have):\n"
         for r in false_triggers:
-            prompt += f'  - "{r["query"]}" (triggered {r["triggers"]}/{r["runs"]} times)\n'
+            prompt += f'  - "{r["query"]}" (triggered {r["triggers"]}/{r["runs"]} times{timed_out_note(r)})\n'
         prompt += "\n"
 
     if history:
@@ -82,7 +126,7 @@ Current scores ({scores_summary}):
                 prompt += "Train results:\n"
                 for r in h["results"]:
                     status = "PASS" if r["pass"] else "FAIL"
-                    prompt += f'  [{status}] "{r["query"][:80]}" (triggered {r["triggers"]}/{r["runs"]})\n'
+                    prompt += f'  [{status}] "{r["query"][:80]}" (triggered {r["triggers"]}/{r["runs"]}{timed_out_note(r)})\n'
             if h.get("note"):
                 prompt += f'Note: {h["note"]}\n'
             prompt += "</attempt>\n\n"
@@ -109,9 +153,20 @@ Here are some tips that we've found to work well in writing these descriptions:
 
 I'd encourage you to be creative and mix up the style in different iterations since you'll have multiple opportunities to try different approaches and we'll just grab the highest-scoring one at the end. 
 
-Please respond with only the new description text in <new_description> tags, nothing else."""
+"""
+    focus = CANDIDATE_FOCUSES[(candidate - 1) % len(CANDIDATE_FOCUSES)] if candidate is not None else None
+    if focus:
+        prompt += f"""Several descriptions are being written in parallel for this iteration and the best one will be kept, so take this particular angle for yours:
+<focus>
+{focus}
+</focus>
+
+"""
+    prompt += "Please respond with only the new description text in <new_description> tags, nothing else."
 
-    response = client.messages.create(
+    response = create_message(
+        client,
+        governor,
         model=model,
         max_tokens=16000,
         thinking={
@@ -137,6 +192,8 @@ Please respond with only the new description text in <new_description> tags, not
     # Log the transcript
     transcript: dict = {
         "iteration": iteration,
+        "candidate": candidate,
+        "focus": focus,
         "prompt": prompt,
         "thinking": thinking_text,
         "response": text,
@@ -148,7 +205,9 @@ Please respond with only the new description text in <new_description> tags, not
     # If over 1024 chars, ask the model to shorten it
     if len(description) > 1024:
         shorten_prompt = f"Your description is {len(description)} characters, which exceeds the hard 1024 character limit. Please rewrite it to be under 1024 characters while preserving the most important trigger words and intent coverage. Respond with only the new description in <new_description> tags."
-        shorten_response = client.messages.create(
+        shorten_response = create_message(
+            client,
+            governor,
             model=model,
             max_tokens=16000,
             thinking={
@@ -184,7 +243,8 @@ Please respond with only the new description text in <new_description> tags, not
 
     if log_dir:
         log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / f"improve_iter_{iteration or 'unknown'}.json"
+        suffix = f"_cand_{candidate}" if candidate is not None else ""
+        log_file = log_dir / f"improve_iter_{iteration or 'unknown'}{suffix}.json"
         log_file.write_text(json.dumps(transcript, indent=2))
 
     return description
@@ -225,6 +285,7 @@ def main():
         eval_results=eval_results,
         history=history,
         model=args.model,
+        governor=RateGovernor(1),
     )
 
     if args.verbose:
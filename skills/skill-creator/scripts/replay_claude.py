@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Record and replay `claude -p` stream-json output.
+
+Recording: run_eval.py --record-dir DIR saves the raw stream of every run as a
+fixture (one JSON file per run) via StreamRecorder. The random command name of
+the run is replaced by a placeholder so the fixture can be replayed against
+any later run.
+
+Replaying: this file is also a stand-in `claude` executable. Point run_eval.py
+at it with --claude-bin and it answers `claude -p <query> ...` by writing a
+recorded stream back to stdout, optionally with the original timing:
+
+    CLAUDE_REPLAY_DIR=fixtures/ python -m scripts.run_eval \
+        --claude-bin scripts/replay_claude.py --eval-set evals.json --skill-path my-skill
+
+Environment variables read in replay mode:
+    CLAUDE_REPLAY_DIR       Fixture directory (required)
+    CLAUDE_REPLAY_LATENCY   Multiplier for recorded inter-line delays (default 1.0, 0 = as fast as possible)
+    CLAUDE_REPLAY_STARTUP   Extra seconds to sleep before the first line (default 0)
+    CLAUDE_REPLAY_FALLBACK  "any" to replay a random fixture for unknown queries,
+                            otherwise emit a stream that does not trigger (default)
+    SKILL_CREATOR_COMMAND_NAME  Set by run_eval.py; substituted for the placeholder
+
+Stdlib only, so it runs without the scripts package on the path.
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+FIXTURE_VERSION = 1
+COMMAND_PLACEHOLDER = "{{COMMAND_NAME}}"
+COMMAND_NAME_ENV = "SKILL_CREATOR_COMMAND_NAME"
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()[:16]
+
+
+class StreamRecorder:
+    """Collect the lines of one run with the time each one completed."""
+
+    def __init__(self, query: str, command_name: str, model: str | None = None):
+        self.query = query
+        self.command_name = command_name
+        self.model = model
+        self._start = time.monotonic()
+        self._partial = bytearray()
+        self.lines: list[tuple[float, str]] = []
+
+    def feed(self, chunk: bytes) -> None:
+        elapsed = time.monotonic() - self._start
+        self._partial += chunk
+        *complete, rest = self._partial.split(b"\n")
+        for line in complete:
+            self._add(elapsed, line)
+        self._partial = bytearray(rest)
+
+    def _add(self, elapsed: float, line: bytes) -> None:
+        text = line.decode("utf-8", errors="replace")
+        self.lines.append((round(elapsed, 4), text.replace(self.command_name, COMMAND_PLACEHOLDER)))
+
+    def save(self, record_dir: Path, triggered: bool | None) -> Path:
+        """Write the fixture and return its path. Any unterminated line is kept."""
+        if self._partial:
+            self._add(time.monotonic() - self._start, bytes(self._partial))
+            self._partial.clear()
+        record_dir.mkdir(parents=True, exist_ok=True)
+        path = record_dir / f"{query_hash(self.query)}-{os.urandom(4).hex()}.json"
+        path.write_text(json.dumps({
+            "version": FIXTURE_VERSION,
+            "query": self.query,
+            "model": self.model,
+            "triggered": triggered,
+            "lines": self.lines,
+        }))
+        return path
+
+
+def load_fixtures(fixture_dir: Path) -> list[dict]:
+    """Load every fixture in a directory, skipping unreadable files."""
+    fixtures = []
+    for path in sorted(fixture_dir.glob("*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (json.JSONDecodeError, OSError):
+            continue
+        if data.get("version") == FIXTURE_VERSION:
+            fixtures.append(data)
+    return fixtures
+
+
+def _non_trigger_stream() -> list[tuple[float, str]]:
+    events = [
+        {"type": "system", "subtype": "init"},
+        {"type": "stream_event", "event": {"type": "message_stop"}},
+        {"type": "result", "subtype": "success", "is_error": False},
+    ]
+    return [(0.0, json.dumps(e)) for e in events]
+
+
+def replay(lines: list[tuple[float, str]], command_name: str, latency: float, startup: float) -> None:
+    out = sys.stdout.buffer
+    if startup > 0:
+        time.sleep(startup)
+    previous = 0.0
+    for elapsed, text in lines:
+        delay = (elapsed - previous) * latency
+        if delay > 0:
+            time.sleep(delay)
+        previous = elapsed
+        out.write(text.replace(COMMAND_PLACEHOLDER, command_name).encode("utf-8") + b"\n")
+        out.flush()
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    if "-p" not in argv or argv.index("-p") + 1 >= len(argv):
+        print("replay_claude: expected -p <query>", file=sys.stderr)
+        sys.exit(2)
+    query = argv[argv.index("-p") + 1]
+
+    fixture_dir = os.environ.get("CLAUDE_REPLAY_DIR")
+    if not fixture_dir:
+        print("replay_claude: CLAUDE_REPLAY_DIR is not set", file=sys.stderr)
+        sys.exit(2)
+
+    fixture_dir = Path(fixture_dir)
+    matching = [json.loads(p.read_text()) for p in sorted(fixture_dir.glob(f"{query_hash(query)}-*.json"))]
+    if not matching and os.environ.get("CLAUDE_REPLAY_FALLBACK") == "any":
+        matching = load_fixtures(fixture_dir)
+    lines = random.choice(matching)["lines"] if matching else _non_trigger_stream()
+
+    try:
+        replay(
+            lines,
+            command_name=os.environ.get(COMMAND_NAME_ENV, COMMAND_PLACEHOLDER),
+            latency=float(os.environ.get("CLAUDE_REPLAY_LATENCY", "1.0")),
+            startup=float(os.environ.get("CLAUDE_REPLAY_STARTUP", "0")),
+        )
+    except BrokenPipeError:
+        # run_eval kills us as soon as it has decided; that is expected
+        pass
+
+
+if __name__ == "__main__":
+    main()
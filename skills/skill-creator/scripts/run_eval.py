@@ -2,21 +2,52 @@
 """Run trigger evaluation for a skill description.
 
 Tests whether a skill's description causes Claude to trigger (read the skill)
-for a set of queries. Outputs results as JSON.
+for a set of queries. Outputs results as JSON, or as JSON lines while the
+eval progresses with --stream.
 """
 
 import argparse
+import asyncio
+import atexit
+import concurrent.futures
 import json
+import math
 import os
-import select
-import subprocess
+import signal
 import sys
+import threading
 import time
 import uuid
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from statistics import NormalDist
 
-from scripts.utils import parse_skill_md
+from scripts.rate_limit import RateGovernor, is_throttle_text
+from scripts.replay_claude import COMMAND_NAME_ENV, StreamRecorder
+from scripts.sandbox import SandboxPool
+from scripts.stream_parser import StreamJsonParser, TriggerDetector
+from scripts.trigger_cache import (
+    DEFAULT_TTL_SECONDS,
+    TriggerCache,
+    cache_context,
+    default_cache_dir,
+    make_cache_key,
+)
+from scripts.utils import parse_skill_md, percentiles, write_command_file
+
+# Bump whenever TriggerDetector or its use in run_single_query changes, so results
+# cached by an older detector are not reused.
+TRIGGER_DETECTION_VERSION = 1
+
+# Bytes requested per read from the claude -p stdout pipe.
+READ_CHUNK_SIZE = 64 * 1024
+
+# Decided runs observed in an eval before hedging kicks in
+HEDGE_MIN_SAMPLES = 5
+
+# Times a run throttled by the API is retried before it is given up on
+MAX_THROTTLE_RETRIES = 5
 
 
 def find_project_root() -> Path:
@@ -32,156 +63,335 @@ def find_project_root() -> Path:
     return current
 
 
-def run_single_query(
+# Command files currently on disk, removed at interpreter exit if a crash or
+# signal skipped the normal cleanup.
+_registered_command_files: set[Path] = set()
+_cleanup_installed = False
+
+
+def _remove_registered_command_files() -> None:
+    for path in list(_registered_command_files):
+        path.unlink(missing_ok=True)
+        _registered_command_files.discard(path)
+
+
+def _exit_on_signal(signum, frame) -> None:
+    # Turn SIGTERM/SIGHUP into SystemExit so finally blocks and atexit run
+    raise SystemExit(128 + signum)
+
+
+def install_cleanup_handlers() -> None:
+    """Make sure registered command files are removed on exit, SIGTERM and SIGHUP.
+
+    Signal handlers can only be installed from the main thread; elsewhere
+    only the atexit hook is registered. Handlers set by the caller are kept.
+    """
+    global _cleanup_installed
+    if _cleanup_installed:
+        return
+    _cleanup_installed = True
+    atexit.register(_remove_registered_command_files)
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for sig in (signal.SIGTERM, getattr(signal, "SIGHUP", None)):
+        if sig is not None and signal.getsignal(sig) is signal.SIG_DFL:
+            signal.signal(sig, _exit_on_signal)
+
+
+@contextmanager
+def registered_command(project_root: Path, skill_name: str, description: str) -> Iterator[str]:
+    """Register one command file for a description and yield its name.
+
+    Every run of the same description can share the file, so an eval does
+    one create/delete instead of one per run, and concurrent runs do not
+    see each other's copies of the skill.
+    """
+    install_cleanup_handlers()
+    command_name = f"{skill_name}-skill-{uuid.uuid4().hex[:8]}"
+    command_file = write_command_file(project_root / ".claude" / "commands", command_name, skill_name, description)
+    _registered_command_files.add(command_file)
+    try:
+        yield command_name
+    finally:
+        command_file.unlink(missing_ok=True)
+        _registered_command_files.discard(command_file)
+
+
+async def run_query_timed(
     query: str,
     skill_name: str,
     skill_description: str,
     timeout: int,
     project_root: str,
     model: str | None = None,
-) -> bool:
-    """Run a single query and return whether the skill was triggered.
+    claude_bin: str = "claude",
+    record_dir: Path | None = None,
+    command_name: str | None = None,
+) -> dict:
+    """Run a single query and return a run record with timing.
 
-    Creates a command file in .claude/commands/ so it appears in Claude's
-    available_skills list, then runs `claude -p` with the raw query.
-    Uses --include-partial-messages to detect triggering early from
-    stream events (content_block_start) rather than waiting for the
-    full assistant message, which only arrives after tool execution.
+    The skill is exposed as a command file in .claude/commands/ so it
+    appears in Claude's available_skills list, then `claude -p` runs with
+    the raw query. Pass the command_name of a file already registered with
+    registered_command() to reuse it; otherwise one is created for this run.
+    Uses --include-partial-messages so TriggerDetector can decide early
+    from stream events rather than waiting for the full assistant message.
+
+    If record_dir is given, the raw stream of a run that finishes is saved
+    there as a replay fixture (see replay_claude.py); cancelled runs are not.
+
+    The record holds "triggered", "timed_out", "decision_source" ("stream_event",
+    "assistant", "result", "eof" or "timeout"), "bytes_read", and the seconds
+    since spawn was requested for "spawn_s", "first_event_s" and "decision_s".
     """
-    unique_id = uuid.uuid4().hex[:8]
-    clean_name = f"{skill_name}-skill-{unique_id}"
-    project_commands_dir = Path(project_root) / ".claude" / "commands"
-    command_file = project_commands_dir / f"{clean_name}.md"
+    if command_name is None:
+        with registered_command(Path(project_root), skill_name, skill_description) as command_name:
+            return await run_query_timed(
+                query, skill_name, skill_description, timeout, project_root, model,
+                claude_bin, record_dir, command_name,
+            )
+    clean_name = command_name
+    cmd = [
+        claude_bin,
+        "-p", query,
+        "--output-format", "stream-json",
+        "--verbose",
+        "--include-partial-messages",
+    ]
+    if model:
+        cmd.extend(["--model", model])
+
+    # Remove CLAUDECODE env var to allow nesting claude -p inside a
+    # Claude Code session. The guard is for interactive terminal conflicts;
+    # programmatic subprocess usage is safe.
+    env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+    env[COMMAND_NAME_ENV] = clean_name
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        cwd=project_root,
+        env=env,
+    )
+    spawn_s = loop.time() - started
+
+    parser = StreamJsonParser()
+    detector = TriggerDetector(clean_name)
+    recorder = StreamRecorder(query, clean_name, model) if record_dir else None
+    deadline = started + timeout
+    first_event_s = None
+    decision_source = "timeout"
+    throttled = False
 
     try:
-        project_commands_dir.mkdir(parents=True, exist_ok=True)
-        # Use YAML block scalar to avoid breaking on quotes in description
-        indented_desc = "\n  ".join(skill_description.split("\n"))
-        command_content = (
-            f"---\n"
-            f"description: |\n"
-            f"  {indented_desc}\n"
-            f"---\n\n"
-            f"# {skill_name}\n\n"
-            f"This skill handles: {skill_description}\n"
-        )
-        command_file.write_text(command_content)
-
-        cmd = [
-            "claude",
-            "-p", query,
-            "--output-format", "stream-json",
-            "--verbose",
-            "--include-partial-messages",
-        ]
-        if model:
-            cmd.extend(["--model", model])
-
-        # Remove CLAUDECODE env var to allow nesting claude -p inside a
-        # Claude Code session. The guard is for interactive terminal conflicts;
-        # programmatic subprocess usage is safe.
-        env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
-
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            cwd=project_root,
-            env=env,
-        )
+        while detector.decision is None:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                chunk = await asyncio.wait_for(process.stdout.read(READ_CHUNK_SIZE), remaining)
+            except asyncio.TimeoutError:
+                break
+            if recorder:
+                recorder.feed(chunk)
+            events = parser.feed(chunk) if chunk else parser.flush()
+            if first_event_s is None and parser.lines_seen:
+                first_event_s = loop.time() - started
+            for event in events:
+                if event.get("type") == "result" and event.get("is_error") and is_throttle_text(str(event.get("result", ""))):
+                    throttled = True
+                if detector.process(event) is not None:
+                    decision_source = detector.source
+                    break
+            if not chunk:
+                if detector.decision is None:
+                    decision_source = "eof"
+                break
+        decision_s = loop.time() - started
+    finally:
+        # Clean up process on any exit path (return, exception, timeout, cancellation)
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
 
-        triggered = False
-        start_time = time.time()
-        buffer = ""
-        # Track state for stream event detection
-        pending_tool_name = None
-        accumulated_json = ""
+    # Only streams that ran to a decision, EOF or the timeout make fixtures;
+    # a cancelled run (hedge loser, early stop, engine close) is cut short
+    # and would replay as a false "not triggered"
+    if recorder:
+        recorder.save(record_dir, detector.decision)
 
-        try:
-            while time.time() - start_time < timeout:
-                if process.poll() is not None:
-                    remaining = process.stdout.read()
-                    if remaining:
-                        buffer += remaining.decode("utf-8", errors="replace")
-                    break
+    return {
+        "triggered": detector.triggered if detector.decision is None else detector.decision,
+        "timed_out": decision_source == "timeout",
+        "throttled": throttled,
+        "decision_source": decision_source,
+        "spawn_s": round(spawn_s, 4),
+        "first_event_s": round(first_event_s, 4) if first_event_s is not None else None,
+        "decision_s": round(decision_s, 4),
+        "bytes_read": parser.bytes_read,
+    }
 
-                ready, _, _ = select.select([process.stdout], [], [], 1.0)
-                if not ready:
-                    continue
 
-                chunk = os.read(process.stdout.fileno(), 8192)
-                if not chunk:
-                    break
-                buffer += chunk.decode("utf-8", errors="replace")
+async def run_single_query_async(
+    query: str,
+    skill_name: str,
+    skill_description: str,
+    timeout: int,
+    project_root: str,
+    model: str | None = None,
+    claude_bin: str = "claude",
+    record_dir: Path | None = None,
+    command_name: str | None = None,
+) -> bool:
+    """Run a single query and return whether the skill was triggered."""
+    record = await run_query_timed(
+        query, skill_name, skill_description, timeout, project_root, model, claude_bin, record_dir, command_name,
+    )
+    return record["triggered"]
 
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
 
-                    try:
-                        event = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
+def run_single_query(
+    query: str,
+    skill_name: str,
+    skill_description: str,
+    timeout: int,
+    project_root: str,
+    model: str | None = None,
+    claude_bin: str = "claude",
+    record_dir: Path | None = None,
+    command_name: str | None = None,
+) -> bool:
+    """Synchronous wrapper around run_single_query_async."""
+    return asyncio.run(run_single_query_async(
+        query, skill_name, skill_description, timeout, project_root, model, claude_bin, record_dir, command_name,
+    ))
 
-                    # Early detection via stream events
-                    if event.get("type") == "stream_event":
-                        se = event.get("event", {})
-                        se_type = se.get("type", "")
-
-                        if se_type == "content_block_start":
-                            cb = se.get("content_block", {})
-                            if cb.get("type") == "tool_use":
-                                tool_name = cb.get("name", "")
-                                if tool_name in ("Skill", "Read"):
-                                    pending_tool_name = tool_name
-                                    accumulated_json = ""
-                                else:
-                                    return False
-
-                        elif se_type == "content_block_delta" and pending_tool_name:
-                            delta = se.get("delta", {})
-                            if delta.get("type") == "input_json_delta":
-                                accumulated_json += delta.get("partial_json", "")
-                                if clean_name in accumulated_json:
-                                    return True
-
-                        elif se_type in ("content_block_stop", "message_stop"):
-                            if pending_tool_name:
-                                return clean_name in accumulated_json
-                            if se_type == "message_stop":
-                                return False
-
-                    # Fallback: full assistant message
-                    elif event.get("type") == "assistant":
-                        message = event.get("message", {})
-                        for content_item in message.get("content", []):
-                            if content_item.get("type") != "tool_use":
-                                continue
-                            tool_name = content_item.get("name", "")
-                            tool_input = content_item.get("input", {})
-                            if tool_name == "Skill" and clean_name in tool_input.get("skill", ""):
-                                triggered = True
-                            elif tool_name == "Read" and clean_name in tool_input.get("file_path", ""):
-                                triggered = True
-                            return triggered
-
-                    elif event.get("type") == "result":
-                        return triggered
-        finally:
-            # Clean up process on any exit path (return, exception, timeout)
-            if process.poll() is None:
-                process.kill()
-                process.wait()
 
-        return triggered
-    finally:
-        if command_file.exists():
-            command_file.unlink()
+def summarize_runs(records: list[dict], cached_runs: int = 0) -> dict:
+    """Aggregate run records from run_query_timed into latency percentiles."""
+    sources: dict[str, int] = {}
+    for record in records:
+        sources[record["decision_source"]] = sources.get(record["decision_source"], 0) + 1
+    return {
+        "executed_runs": len(records),
+        "cached_runs": cached_runs,
+        "spawn_s": percentiles([r["spawn_s"] for r in records if r.get("spawn_s") is not None]),
+        "first_event_s": percentiles([r["first_event_s"] for r in records if r.get("first_event_s") is not None]),
+        "decision_s": percentiles([r["decision_s"] for r in records if r.get("decision_s") is not None]),
+        "decision_sources": sources,
+        "bytes_read": sum(r.get("bytes_read", 0) for r in records),
+        "hedged": sum(1 for r in records if r.get("hedged")),
+        "hedge_wins": sum(1 for r in records if r.get("hedge_won")),
+    }
 
 
-def run_eval(
+def format_timing(timing: dict) -> str:
+    """One-line human summary of a timing dict from summarize_runs."""
+    def pct(stats: dict) -> str:
+        if stats["p50"] is None:
+            return "n/a"
+        return f"p50={stats['p50']:.2f}s p95={stats['p95']:.2f}s p99={stats['p99']:.2f}s"
+
+    sources = ", ".join(f"{k}={v}" for k, v in sorted(timing["decision_sources"].items())) or "none"
+    wall = f" in {timing['wall_s']:.1f}s" if "wall_s" in timing else ""
+    hedged = f"; hedged {timing['hedged']} ({timing['hedge_wins']} won)" if timing.get("hedged") else ""
+    return (
+        f"Timing: {timing['executed_runs']} runs ({timing['cached_runs']} cached){wall}; "
+        f"decision {pct(timing['decision_s'])}; first event {pct(timing['first_event_s'])}; "
+        f"spawn {pct(timing['spawn_s'])}; sources: {sources}{hedged}"
+    )
+
+
+def summarize_query(
+    item: dict,
+    triggers: list[bool],
+    records: list[dict],
+    trigger_threshold: float,
+    cached_runs: int = 0,
+) -> dict:
+    """Build the result entry of one query from its decided triggers and executed run records.
+
+    cached_runs is how many of the triggers came from the cache rather than
+    from records.
+    """
+    timed_out = sum(1 for r in records if r["timed_out"])
+    should_trigger = item["should_trigger"]
+    if triggers:
+        trigger_rate = sum(triggers) / len(triggers)
+        if should_trigger:
+            did_pass = trigger_rate >= trigger_threshold
+        else:
+            did_pass = trigger_rate < trigger_threshold
+    else:
+        # Every run timed out: there is no rate to judge
+        trigger_rate = None
+        did_pass = False
+    return {
+        "query": item["query"],
+        "should_trigger": should_trigger,
+        "trigger_rate": trigger_rate,
+        "triggers": sum(triggers),
+        "runs": len(triggers),
+        "timed_out": timed_out,
+        "pass": did_pass,
+        "timing": summarize_runs(records, cached_runs=cached_runs),
+    }
+
+
+def required_triggers(runs: int, trigger_threshold: float) -> int:
+    """Smallest trigger count whose rate over `runs` meets the threshold.
+
+    Returns runs + 1 when no count can reach it (threshold above 1.0).
+    """
+    for k in range(runs + 1):
+        if k / runs >= trigger_threshold:
+            return k
+    return runs + 1
+
+
+def is_decided(
+    triggers: int,
+    completed: int,
+    runs: int,
+    trigger_threshold: float,
+    early_stop: str = "off",
+    confidence: float = 0.95,
+) -> bool:
+    """Whether further runs of a query can no longer change its verdict.
+
+    "exact" stops only when the outcome is fixed whatever the remaining
+    runs return, so verdicts are identical to running all of them. "wilson"
+    also stops once the Wilson score interval of the observed trigger rate
+    lies entirely on one side of the threshold at the given confidence.
+    """
+    if early_stop == "off" or completed >= runs or completed == 0:
+        return completed >= runs
+    required = required_triggers(runs, trigger_threshold)
+    if triggers >= required or triggers + (runs - completed) < required:
+        return True
+    if early_stop == "wilson":
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        p = triggers / completed
+        denom = 1 + z * z / completed
+        center = (p + z * z / (2 * completed)) / denom
+        margin = z * math.sqrt(p * (1 - p) / completed + z * z / (4 * completed * completed)) / denom
+        return center - margin >= trigger_threshold or center + margin < trigger_threshold
+    return False
+
+
+def runs_to_decide(triggers: int, completed: int, runs: int, trigger_threshold: float) -> int:
+    """Fewest additional runs that could settle the verdict of a query."""
+    required = required_triggers(runs, trigger_threshold)
+    remaining = runs - completed
+    to_pass = required - triggers
+    to_fail = remaining - to_pass + 1
+    return max(1, min(to_pass, to_fail, remaining))
+
+
+async def run_eval_async(
     eval_set: list[dict],
     skill_name: str,
     description: str,
@@ -191,58 +401,225 @@ def run_eval(
     runs_per_query: int = 1,
     trigger_threshold: float = 0.5,
     model: str | None = None,
+    cache: TriggerCache | None = None,
+    early_stop: str = "off",
+    confidence: float = 0.95,
+    claude_bin: str = "claude",
+    record_dir: Path | None = None,
+    sandboxes: SandboxPool | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    hedge_percentile: int = 0,
+    on_event: Callable[[dict], None] | None = None,
+    governor: RateGovernor | None = None,
 ) -> dict:
-    """Run the full eval set and return results."""
-    results = []
-
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        future_to_info = {}
-        for item in eval_set:
-            for run_idx in range(runs_per_query):
-                future = executor.submit(
-                    run_single_query,
-                    item["query"],
-                    skill_name,
-                    description,
-                    timeout,
-                    str(project_root),
-                    model,
-                )
-                future_to_info[future] = (item, run_idx)
-
-        query_triggers: dict[str, list[bool]] = {}
-        query_items: dict[str, dict] = {}
-        for future in as_completed(future_to_info):
-            item, _ = future_to_info[future]
-            query = item["query"]
-            query_items[query] = item
-            if query not in query_triggers:
-                query_triggers[query] = []
+    """Run the full eval set on the running event loop and return results.
+
+    All `claude -p` children are driven from this one process; a semaphore
+    caps how many are alive at once, so num_workers is bounded by file
+    descriptors and API quota rather than CPU cores.
+
+    The description is registered as a single command file shared by all
+    runs and removed when the eval finishes, even on error or SIGTERM.
+    With a SandboxPool, each concurrent run instead gets its own project
+    root holding only this description's command file.
+
+    If a cache is given, runs already recorded for the same query,
+    description and model, in the same project with the same claude binary
+    (see cache_context), are reused and only the missing runs are executed.
+
+    With early_stop set to "exact" or "wilson", each query only schedules
+    as many runs as could settle its verdict, and stops (cancelling runs
+    still queued) once is_decided() says the rest cannot matter.
+
+    Pass a semaphore to share the concurrency limit with other evals running
+    on the same loop (see EvalEngine); num_workers is then ignored.
+
+    With hedge_percentile set (e.g. 95), a run still undecided after that
+    percentile of the decision times seen so far in this eval gets a
+    duplicate, and whichever decides first is used. Runs that time out
+    count toward a query's "timed_out" total, not toward its trigger rate,
+    and are not cached.
+
+    Every claude -p also takes a slot from the governor (pass one to share
+    rate limits between evals). Runs that report API throttling shrink its
+    concurrency limit and are retried after its backoff, up to
+    MAX_THROTTLE_RETRIES times, rather than counting as "not triggered".
+
+    on_event, if given, is called on the event loop with a "run" event for
+    every run as it finishes (cached runs included) and a "query" event,
+    carrying the query's result entry, as soon as that query is settled.
+    """
+    query_results: dict[str, dict] = {}
+    query_triggers: dict[str, list[bool]] = {}
+    query_items: dict[str, dict] = {}
+    query_records: dict[str, list[dict]] = {}
+    decision_times: list[float] = []
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, num_workers))
+    if governor is None:
+        governor = RateGovernor(num_workers)
+    command_name = None
+    started = time.monotonic()
+    context = cache_context(project_root, claude_bin, sandboxes is not None) if cache is not None else ""
+
+    def emit(event: dict) -> None:
+        if on_event is not None:
+            on_event(event)
+
+    async def run_attempt(query: str) -> dict:
+        async with governor.slot_async() as permit:
+            record = await spawn(query)
+            if record["throttled"]:
+                permit.throttle()
+            return record
+
+    async def spawn(query: str) -> dict:
+        if sandboxes is None:
+            return await run_query_timed(
+                query,
+                skill_name,
+                description,
+                timeout,
+                str(project_root),
+                model,
+                claude_bin,
+                record_dir,
+                command_name,
+            )
+        async with sandboxes.checkout(skill_name, description) as (sandbox_root, sandbox_command):
+            return await run_query_timed(
+                query,
+                skill_name,
+                description,
+                timeout,
+                str(sandbox_root),
+                model,
+                claude_bin,
+                record_dir,
+                sandbox_command,
+            )
+
+    def hedge_delay() -> float | None:
+        if not hedge_percentile or len(decision_times) < HEDGE_MIN_SAMPLES:
+            return None
+        return percentiles(decision_times, (hedge_percentile,))[f"p{hedge_percentile}"]
+
+    async def run_hedge(query: str) -> dict:
+        async with semaphore:
+            return await run_attempt(query)
+
+    async def run_one(query: str) -> dict:
+        async with semaphore:
+            delay = hedge_delay()
+            if delay is None:
+                return await run_attempt(query)
+            primary = asyncio.create_task(run_attempt(query))
+            tasks = [primary]
             try:
-                query_triggers[query].append(future.result())
-            except Exception as e:
-                print(f"Warning: query failed: {e}", file=sys.stderr)
-                query_triggers[query].append(False)
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if done:
+                    return primary.result()
+                # The primary is a straggler: race a duplicate (in its own
+                # worker slot) and keep the first attempt that decides
+                hedge = asyncio.create_task(run_hedge(query))
+                tasks.append(hedge)
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None and not task.result()["timed_out"]:
+                            return dict(task.result(), hedged=True, hedge_won=task is hedge)
+                for task in tasks:
+                    if task.exception() is None:
+                        return dict(task.result(), hedged=True, hedge_won=False)
+                return primary.result()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def evaluate_query(query: str) -> None:
+        triggers = query_triggers[query]
+        records = query_records[query]
+        cache_key = None
+        cached: dict[int, bool] = {}
+        if cache is not None:
+            cache_key = make_cache_key(query, skill_name, description, model, TRIGGER_DETECTION_VERSION, context)
+            cached = cache.get_runs(cache_key, runs_per_query)
+            triggers.extend(cached.values())
+            for run_idx, triggered in sorted(cached.items()):
+                emit({"type": "run", "query": query, "run_idx": run_idx, "cached": True, "triggered": triggered})
+        todo = [run_idx for run_idx in range(runs_per_query) if run_idx not in cached]
+        in_flight: dict[asyncio.Task, int] = {}
+        throttle_retries: dict[int, int] = {}
 
-    for query, triggers in query_triggers.items():
-        item = query_items[query]
-        trigger_rate = sum(triggers) / len(triggers)
-        should_trigger = item["should_trigger"]
-        if should_trigger:
-            did_pass = trigger_rate >= trigger_threshold
-        else:
-            did_pass = trigger_rate < trigger_threshold
-        results.append({
-            "query": query,
-            "should_trigger": should_trigger,
-            "trigger_rate": trigger_rate,
-            "triggers": sum(triggers),
-            "runs": len(triggers),
-            "pass": did_pass,
-        })
+        try:
+            while not is_decided(sum(triggers), len(triggers), runs_per_query, trigger_threshold, early_stop, confidence):
+                if early_stop == "off":
+                    wanted = len(todo)
+                else:
+                    wanted = runs_to_decide(sum(triggers), len(triggers), runs_per_query, trigger_threshold) - len(in_flight)
+                for _ in range(min(wanted, len(todo))):
+                    task = asyncio.create_task(run_one(query))
+                    in_flight[task] = todo.pop(0)
+                if not in_flight:
+                    break
 
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    run_idx = in_flight.pop(task)
+                    try:
+                        record = task.result()
+                    except Exception as e:
+                        print(f"Warning: query failed: {e}", file=sys.stderr)
+                        record = {"triggered": False, "timed_out": False, "decision_source": "error"}
+                    if record.get("throttled") and throttle_retries.get(run_idx, 0) < MAX_THROTTLE_RETRIES:
+                        # The governor has backed off; run it again once it allows
+                        throttle_retries[run_idx] = throttle_retries.get(run_idx, 0) + 1
+                        todo.insert(0, run_idx)
+                        continue
+                    records.append(record)
+                    if cache is not None:
+                        cache.record_miss()
+                    emit({"type": "run", "query": query, "run_idx": run_idx, "cached": False, **record})
+                    if record["decision_source"] == "error":
+                        triggers.append(False)
+                        continue
+                    if record["timed_out"] or record.get("throttled"):
+                        # No decision was reached; don't let it count as "not triggered"
+                        continue
+                    triggers.append(record["triggered"])
+                    decision_times.append(record["decision_s"])
+                    if cache is not None:
+                        cache.put_run(cache_key, run_idx, record["triggered"])
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        result = summarize_query(query_items[query], triggers, records, trigger_threshold, cached_runs=len(cached))
+        query_results[query] = result
+        emit({"type": "query", **result})
+
+    for item in eval_set:
+        query_items.setdefault(item["query"], item)
+        query_triggers.setdefault(item["query"], [])
+        query_records.setdefault(item["query"], [])
+
+    if sandboxes is not None:
+        await asyncio.gather(*(evaluate_query(query) for query in query_items))
+    else:
+        # One command file serves every run of this description
+        with registered_command(Path(project_root), skill_name, description) as command_name:
+            await asyncio.gather(*(evaluate_query(query) for query in query_items))
+
+    results = [query_results[query] for query in query_items]
     passed = sum(1 for r in results if r["pass"])
     total = len(results)
+    all_records = [record for records in query_records.values() for record in records]
+    timing = summarize_runs(all_records, cached_runs=sum(r["timing"]["cached_runs"] for r in results))
+    timing["wall_s"] = round(time.monotonic() - started, 4)
 
     return {
         "skill_name": skill_name,
@@ -252,20 +629,217 @@ def run_eval(
             "total": total,
             "passed": passed,
             "failed": total - passed,
+            "timed_out_runs": sum(r["timed_out"] for r in results),
         },
+        "timing": timing,
     }
 
 
+class EvalEngine:
+    """Long-lived evaluation engine shared by many run_eval calls.
+
+    Owns an event loop running on a background thread, the concurrency
+    limit and RateGovernor for claude -p children, and optionally a TriggerCache and a
+    SandboxPool, which it closes on exit. run_loop keeps one engine for the
+    whole optimization run instead of paying setup on every iteration, and
+    several evals can be in flight on it at once via submit().
+
+        with EvalEngine(num_workers=10, cache=cache) as engine:
+            output = run_eval(..., engine=engine)
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        cache: TriggerCache | None = None,
+        sandboxes: SandboxPool | None = None,
+        governor: RateGovernor | None = None,
+    ):
+        self.num_workers = max(1, num_workers)
+        self.cache = cache
+        self.sandboxes = sandboxes
+        self.governor = governor or RateGovernor(self.num_workers)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        # Signal handlers can only be installed from the main thread
+        install_cleanup_handlers()
+
+    def __enter__(self) -> "EvalEngine":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(self.num_workers)
+        self._thread = threading.Thread(target=self._loop.run_forever, name="eval-engine", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        eval_set: list[dict],
+        skill_name: str,
+        description: str,
+        timeout: int,
+        project_root: Path,
+        runs_per_query: int = 1,
+        trigger_threshold: float = 0.5,
+        model: str | None = None,
+        early_stop: str = "off",
+        confidence: float = 0.95,
+        claude_bin: str = "claude",
+        record_dir: Path | None = None,
+        hedge_percentile: int = 0,
+        on_event: Callable[[dict], None] | None = None,
+    ) -> concurrent.futures.Future:
+        """Start evaluating a description; returns a future for the run_eval output.
+
+        on_event is called on the engine thread.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(run_eval_async(
+            eval_set=eval_set,
+            skill_name=skill_name,
+            description=description,
+            num_workers=self.num_workers,
+            timeout=timeout,
+            project_root=project_root,
+            runs_per_query=runs_per_query,
+            trigger_threshold=trigger_threshold,
+            model=model,
+            cache=self.cache,
+            early_stop=early_stop,
+            confidence=confidence,
+            claude_bin=claude_bin,
+            record_dir=record_dir,
+            sandboxes=self.sandboxes,
+            semaphore=self._semaphore,
+            hedge_percentile=hedge_percentile,
+            on_event=on_event,
+            governor=self.governor,
+        ), self._loop)
+
+    def evaluate(self, *args, **kwargs) -> dict:
+        """Blocking form of submit()."""
+        return self.submit(*args, **kwargs).result()
+
+    async def _cancel_all(self) -> None:
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self) -> None:
+        """Cancel in-flight evals (killing their children), stop the loop, close cache and sandboxes."""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+        if self.sandboxes is not None:
+            self.sandboxes.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def run_eval(
+    eval_set: list[dict],
+    skill_name: str,
+    description: str,
+    num_workers: int,
+    timeout: int,
+    project_root: Path,
+    runs_per_query: int = 1,
+    trigger_threshold: float = 0.5,
+    model: str | None = None,
+    cache: TriggerCache | None = None,
+    early_stop: str = "off",
+    confidence: float = 0.95,
+    claude_bin: str = "claude",
+    record_dir: Path | None = None,
+    sandboxes: SandboxPool | None = None,
+    engine: EvalEngine | None = None,
+    hedge_percentile: int = 0,
+    on_event: Callable[[dict], None] | None = None,
+    governor: RateGovernor | None = None,
+) -> dict:
+    """Run the full eval set and return results.
+
+    With an engine, the eval runs on it and uses its worker limit, cache,
+    sandboxes and governor; the corresponding arguments are then ignored.
+    """
+    if engine is not None:
+        return engine.evaluate(
+            eval_set=eval_set,
+            skill_name=skill_name,
+            description=description,
+            timeout=timeout,
+            project_root=project_root,
+            runs_per_query=runs_per_query,
+            trigger_threshold=trigger_threshold,
+            model=model,
+            early_stop=early_stop,
+            confidence=confidence,
+            claude_bin=claude_bin,
+            record_dir=record_dir,
+            hedge_percentile=hedge_percentile,
+            on_event=on_event,
+        )
+    return asyncio.run(run_eval_async(
+        eval_set=eval_set,
+        skill_name=skill_name,
+        description=description,
+        num_workers=num_workers,
+        timeout=timeout,
+        project_root=project_root,
+        runs_per_query=runs_per_query,
+        trigger_threshold=trigger_threshold,
+        model=model,
+        cache=cache,
+        early_stop=early_stop,
+        confidence=confidence,
+        claude_bin=claude_bin,
+        record_dir=record_dir,
+        sandboxes=sandboxes,
+        hedge_percentile=hedge_percentile,
+        on_event=on_event,
+        governor=governor,
+    ))
+
+
+def print_json_line(event: dict) -> None:
+    print(json.dumps(event), flush=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run trigger evaluation for a skill description")
     parser.add_argument("--eval-set", required=True, help="Path to eval set JSON file")
     parser.add_argument("--skill-path", required=True, help="Path to skill directory")
     parser.add_argument("--description", default=None, help="Override description to test")
-    parser.add_argument("--num-workers", type=int, default=10, help="Number of parallel workers")
+    parser.add_argument("--num-workers", type=int, default=10, help="Max concurrent claude -p processes")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
     parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
     parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold")
     parser.add_argument("--model", default=None, help="Model to use for claude -p (default: user's configured model)")
+    parser.add_argument("--early-stop", choices=["off", "exact", "wilson"], default="off", help="Stop running a query once its verdict is decided ('exact' never changes verdicts)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --early-stop wilson")
+    parser.add_argument("--cache", action="store_true", help=f"Reuse trigger results cached in {default_cache_dir()} for the same description, project and claude binary")
+    parser.add_argument("--cache-dir", default=None, help="Trigger result cache directory (implies --cache)")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL_SECONDS, help="Seconds before a cached result expires")
+    parser.add_argument("--claude-bin", default="claude", help="claude executable to run (e.g. scripts/replay_claude.py for offline runs)")
+    parser.add_argument("--record-dir", default=None, help="Save the raw stream of every run here as a replay fixture")
+    parser.add_argument("--sandbox", action="store_true", help="Run each concurrent claude -p in its own copy of the project's .claude/ (on /dev/shm when available)")
+    parser.add_argument("--sandbox-dir", default=None, help="Where to create sandboxes (default: /dev/shm or the temp dir)")
+    parser.add_argument("--hedge-percentile", type=int, default=0, help="Launch a duplicate of any run still undecided after this percentile of observed decision times (0 = off)")
+    parser.add_argument("--requests-per-minute", type=float, default=None, help="Cap on claude -p runs started per minute (concurrency also backs off automatically when the API throttles)")
+    parser.add_argument("--stream", action="store_true", help="Print JSON lines as runs and queries finish, then a summary line, instead of one JSON document at the end")
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
     args = parser.parse_args()
 
@@ -283,6 +857,16 @@ def main():
     if args.verbose:
         print(f"Evaluating: {description}", file=sys.stderr)
 
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = TriggerCache(Path(args.cache_dir) if args.cache_dir else default_cache_dir(), ttl_seconds=args.cache_ttl)
+        cache.prune()
+
+    sandboxes = None
+    if args.sandbox:
+        sandboxes = SandboxPool(project_root, args.num_workers, Path(args.sandbox_dir) if args.sandbox_dir else None)
+
+    governor = RateGovernor(args.num_workers, requests_per_minute=args.requests_per_minute)
     output = run_eval(
         eval_set=eval_set,
         skill_name=name,
@@ -293,17 +877,48 @@ def main():
         runs_per_query=args.runs_per_query,
         trigger_threshold=args.trigger_threshold,
         model=args.model,
+        cache=cache,
+        early_stop=args.early_stop,
+        confidence=args.confidence,
+        claude_bin=args.claude_bin,
+        record_dir=Path(args.record_dir) if args.record_dir else None,
+        sandboxes=sandboxes,
+        hedge_percentile=args.hedge_percentile,
+        on_event=print_json_line if args.stream else None,
+        governor=governor,
     )
 
+    if sandboxes is not None:
+        sandboxes.close()
+
+    if cache is not None:
+        if args.verbose:
+            print(f"Cache: {cache.hits} hits, {cache.misses} misses", file=sys.stderr)
+        cache.close()
+
     if args.verbose:
         summary = output["summary"]
         print(f"Results: {summary['passed']}/{summary['total']} passed", file=sys.stderr)
         for r in output["results"]:
             status = "PASS" if r["pass"] else "FAIL"
             rate_str = f"{r['triggers']}/{r['runs']}"
+            if r["timed_out"]:
+                rate_str += f" ({r['timed_out']} timed out)"
             print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:70]}", file=sys.stderr)
-
-    print(json.dumps(output, indent=2))
+        print(format_timing(output["timing"]), file=sys.stderr)
+        if governor.throttles:
+            print(f"Throttled {governor.throttles} times; concurrency ended at {int(governor.limit)}/{governor.max_concurrency}", file=sys.stderr)
+
+    if args.stream:
+        print_json_line({
+            "type": "summary",
+            "skill_name": output["skill_name"],
+            "description": output["description"],
+            "summary": output["summary"],
+            "timing": output["timing"],
+        })
+    else:
+        print(json.dumps(output, indent=2))
 
 
 if __name__ == "__main__":
@@ -13,13 +13,18 @@ import sys
 import tempfile
 import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import anthropic
 
+from scripts.checkpoint import RunCheckpoint, eval_set_hash
 from scripts.generate_report import generate_html
 from scripts.improve_description import improve_description
-from scripts.run_eval import find_project_root, run_eval
+from scripts.rate_limit import RateGovernor
+from scripts.run_eval import EvalEngine, find_project_root, format_timing, run_eval
+from scripts.sandbox import SandboxPool
+from scripts.trigger_cache import DEFAULT_TTL_SECONDS, TriggerCache, default_cache_dir
 from scripts.utils import parse_skill_md
 
 
@@ -46,6 +51,59 @@ def split_eval_set(eval_set: list[dict], holdout: float, seed: int = 42) -> tupl
     return train_set, test_set
 
 
+def propose_and_evaluate(
+    engine: EvalEngine,
+    beam_width: int,
+    improve_kwargs: dict,
+    eval_kwargs: dict,
+    train_queries: set[str],
+    verbose: bool,
+) -> list[dict]:
+    """Propose beam_width descriptions concurrently and evaluate each as it arrives.
+
+    The improvement calls run on threads while the engine evaluates
+    earlier candidates, so the worker pool stays busy during generation.
+    Each call is numbered as a candidate and so takes a different focus
+    from improve_description.CANDIDATE_FOCUSES.
+    Returns one dict per distinct candidate with its description, run_eval
+    output and train pass count, in arrival order. Candidates whose
+    improvement call fails are dropped; raises if all of them fail.
+    """
+    candidates: list[dict] = []
+    seen: set[str] = set()
+    with ThreadPoolExecutor(max_workers=beam_width) as pool:
+        proposals = [
+            pool.submit(improve_description, **improve_kwargs, candidate=k)
+            for k in range(1, beam_width + 1)
+        ]
+        errors = []
+        for proposal in as_completed(proposals):
+            try:
+                description = proposal.result()
+            except Exception as e:
+                errors.append(e)
+                print(f"Warning: candidate proposal failed: {e}", file=sys.stderr)
+                continue
+            if description in seen:
+                continue
+            seen.add(description)
+            candidates.append({
+                "description": description,
+                "future": engine.submit(description=description, **eval_kwargs),
+            })
+            if verbose:
+                print(f"Candidate {len(candidates)} proposed, evaluating: {description}", file=sys.stderr)
+        if not candidates:
+            raise errors[0]
+
+    for candidate in candidates:
+        candidate["results"] = candidate.pop("future").result()
+        candidate["train_passed"] = sum(
+            1 for r in candidate["results"]["results"] if r["query"] in train_queries and r["pass"]
+        )
+    return candidates
+
+
 def run_loop(
     eval_set: list[dict],
     skill_path: Path,
@@ -60,8 +118,59 @@ def run_loop(
     verbose: bool,
     live_report_path: Path | None = None,
     log_dir: Path | None = None,
+    early_stop: str = "off",
+    confidence: float = 0.95,
+    engine: EvalEngine | None = None,
+    beam_width: int = 1,
+    hedge_percentile: int = 0,
+    checkpoint: RunCheckpoint | None = None,
+    api_governor: RateGovernor | None = None,
 ) -> dict:
-    """Run the eval + improvement loop."""
+    """Run the eval + improvement loop.
+
+    All iterations evaluate on one EvalEngine. Pass one to share its cache
+    and sandboxes; otherwise a plain engine is created for this call.
+
+    With beam_width > 1, each improvement step proposes that many candidates
+    at once (see propose_and_evaluate) and continues with the one that
+    scores best on train. Concurrent candidates must not see each other's
+    command files, so this requires an engine with sandboxes.
+
+    With a checkpoint, every finished iteration is journaled and iterations
+    already in it are restored instead of rerun. Pass the same checkpoint as
+    the engine's cache so individual runs are journaled and skipped too.
+
+    api_governor rate limits the improve_description API calls (the engine
+    has its own for claude -p); by default one sized to the beam is used.
+    """
+    if engine is not None and beam_width > 1 and engine.sandboxes is None:
+        raise ValueError("beam_width > 1 needs an EvalEngine with sandboxes")
+    if engine is None:
+        sandboxes = SandboxPool(find_project_root(), num_workers) if beam_width > 1 else None
+        with EvalEngine(num_workers, sandboxes=sandboxes) as owned_engine:
+            return run_loop(
+                eval_set=eval_set,
+                skill_path=skill_path,
+                description_override=description_override,
+                num_workers=num_workers,
+                timeout=timeout,
+                max_iterations=max_iterations,
+                runs_per_query=runs_per_query,
+                trigger_threshold=trigger_threshold,
+                holdout=holdout,
+                model=model,
+                verbose=verbose,
+                live_report_path=live_report_path,
+                log_dir=log_dir,
+                early_stop=early_stop,
+                confidence=confidence,
+                engine=owned_engine,
+                beam_width=beam_width,
+                hedge_percentile=hedge_percentile,
+                checkpoint=checkpoint,
+                api_governor=api_governor,
+            )
+
     project_root = find_project_root()
     name, original_description, content = parse_skill_md(skill_path)
     current_description = description_override or original_description
@@ -76,10 +185,101 @@ def run_loop(
         test_set = []
 
     client = anthropic.Anthropic()
+    if api_governor is None:
+        api_governor = RateGovernor(beam_width)
     history = []
     exit_reason = "unknown"
+    # (run_eval output, elapsed) of current_description when the beam already evaluated it
+    pending_results = None
+    start_iteration = 1
 
-    for iteration in range(1, max_iterations + 1):
+    def improve_step(iteration: int, current_description: str) -> tuple[str, tuple[dict, float] | None]:
+        """Propose the next description from history[-1].
+
+        Returns it with (run_eval output, elapsed) when the beam already
+        evaluated it, else None.
+        """
+        last = history[-1]
+        if verbose:
+            print(f"\nImproving description...", file=sys.stderr)
+
+        t0 = time.time()
+        # Strip test scores from history so improvement model can't see them
+        blinded_history = [
+            {k: v for k, v in h.items() if not k.startswith("test_")}
+            for h in history
+        ]
+        improve_kwargs = dict(
+            client=client,
+            skill_name=name,
+            skill_content=content,
+            current_description=current_description,
+            eval_results={
+                "results": last["train_results"],
+                "summary": {"passed": last["train_passed"], "failed": last["train_failed"], "total": last["train_total"]},
+            },
+            history=blinded_history,
+            model=model,
+            log_dir=log_dir,
+            iteration=iteration,
+            governor=api_governor,
+        )
+        if beam_width > 1:
+            candidates = propose_and_evaluate(
+                engine=engine,
+                beam_width=beam_width,
+                improve_kwargs=improve_kwargs,
+                eval_kwargs=dict(
+                    eval_set=train_set + test_set,
+                    skill_name=name,
+                    timeout=timeout,
+                    project_root=project_root,
+                    runs_per_query=runs_per_query,
+                    trigger_threshold=trigger_threshold,
+                    model=model,
+                    early_stop=early_stop,
+                    confidence=confidence,
+                    hedge_percentile=hedge_percentile,
+                ),
+                train_queries={q["query"] for q in train_set},
+                verbose=verbose,
+            )
+            # Pick by train score only; test scores stay blind to the optimizer
+            chosen = max(candidates, key=lambda c: c["train_passed"])
+            last["candidates"] = [
+                {"description": c["description"], "train_passed": c["train_passed"], "train_total": last["train_total"]}
+                for c in candidates
+            ]
+            new_description = chosen["description"]
+            beam_results = (chosen["results"], chosen["results"]["timing"]["wall_s"])
+        else:
+            new_description = improve_description(**improve_kwargs)
+            beam_results = None
+        improve_elapsed = time.time() - t0
+
+        if verbose:
+            print(f"Proposed ({improve_elapsed:.1f}s): {new_description}", file=sys.stderr)
+        return new_description, beam_results
+
+    completed = checkpoint.load_iterations() if checkpoint is not None else []
+    if completed:
+        history = [c["entry"] for c in completed]
+        exit_reason = completed[-1]["exit_reason"]
+        current_description = completed[-1]["next_description"] or history[-1]["description"]
+        start_iteration = len(completed) + 1
+        if exit_reason.startswith("all_passed"):
+            start_iteration = max_iterations + 1
+        if verbose:
+            print(f"Resuming after iteration {len(completed)} ({exit_reason})", file=sys.stderr)
+        # next_description is None when the loop ended at that iteration; when
+        # that was only the iteration limit, improve on it before continuing
+        # rather than evaluating the same description again
+        if completed[-1]["next_description"] is None and start_iteration <= max_iterations:
+            current_description, pending_results = improve_step(len(completed), current_description)
+            if checkpoint is not None:
+                checkpoint.record_iteration(history[-1], current_description, exit_reason)
+
+    for iteration in range(start_iteration, max_iterations + 1):
         if verbose:
             print(f"\n{'='*60}", file=sys.stderr)
             print(f"Iteration {iteration}/{max_iterations}", file=sys.stderr)
@@ -88,19 +288,27 @@ def run_loop(
 
         # Evaluate train + test together in one batch for parallelism
         all_queries = train_set + test_set
-        t0 = time.time()
-        all_results = run_eval(
-            eval_set=all_queries,
-            skill_name=name,
-            description=current_description,
-            num_workers=num_workers,
-            timeout=timeout,
-            project_root=project_root,
-            runs_per_query=runs_per_query,
-            trigger_threshold=trigger_threshold,
-            model=model,
-        )
-        eval_elapsed = time.time() - t0
+        if pending_results is not None:
+            all_results, eval_elapsed = pending_results
+            pending_results = None
+        else:
+            t0 = time.time()
+            all_results = run_eval(
+                eval_set=all_queries,
+                skill_name=name,
+                description=current_description,
+                num_workers=num_workers,
+                timeout=timeout,
+                project_root=project_root,
+                runs_per_query=runs_per_query,
+                trigger_threshold=trigger_threshold,
+                model=model,
+                early_stop=early_stop,
+                confidence=confidence,
+                engine=engine,
+                hedge_percentile=hedge_percentile,
+            )
+            eval_elapsed = time.time() - t0
 
         # Split results back into train/test by matching queries
         train_queries_set = {q["query"] for q in train_set}
@@ -137,6 +345,7 @@ def run_loop(
             "failed": train_summary["failed"],
             "total": train_summary["total"],
             "results": train_results["results"],
+            "timing": all_results["timing"],
         })
 
         # Write live report if path provided
@@ -171,50 +380,35 @@ def run_loop(
                 for r in results:
                     status = "PASS" if r["pass"] else "FAIL"
                     rate_str = f"{r['triggers']}/{r['runs']}"
+                    if r.get("timed_out"):
+                        rate_str += f" ({r['timed_out']} timed out)"
                     print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:60]}", file=sys.stderr)
 
             print_eval_stats("Train", train_results["results"], eval_elapsed)
             if test_summary:
                 print_eval_stats("Test ", test_results["results"], 0)
+            print(format_timing(all_results["timing"]), file=sys.stderr)
 
         if train_summary["failed"] == 0:
             exit_reason = f"all_passed (iteration {iteration})"
             if verbose:
                 print(f"\nAll train queries passed on iteration {iteration}!", file=sys.stderr)
+            if checkpoint is not None:
+                checkpoint.record_iteration(history[-1], None, exit_reason)
             break
 
         if iteration == max_iterations:
             exit_reason = f"max_iterations ({max_iterations})"
             if verbose:
                 print(f"\nMax iterations reached ({max_iterations}).", file=sys.stderr)
+            if checkpoint is not None:
+                checkpoint.record_iteration(history[-1], None, exit_reason)
             break
 
         # Improve the description based on train results
-        if verbose:
-            print(f"\nImproving description...", file=sys.stderr)
-
-        t0 = time.time()
-        # Strip test scores from history so improvement model can't see them
-        blinded_history = [
-            {k: v for k, v in h.items() if not k.startswith("test_")}
-            for h in history
-        ]
-        new_description = improve_description(
-            client=client,
-            skill_name=name,
-            skill_content=content,
-            current_description=current_description,
-            eval_results=train_results,
-            history=blinded_history,
-            model=model,
-            log_dir=log_dir,
-            iteration=iteration,
-        )
-        improve_elapsed = time.time() - t0
-
-        if verbose:
-            print(f"Proposed ({improve_elapsed:.1f}s): {new_description}", file=sys.stderr)
-
+        new_description, pending_results = improve_step(iteration, current_description)
+        if checkpoint is not None:
+            checkpoint.record_iteration(history[-1], new_description, exit_reason)
         current_description = new_description
 
     # Find the best iteration by TEST score (or train if no test set)
@@ -250,16 +444,29 @@ def main():
     parser.add_argument("--eval-set", required=True, help="Path to eval set JSON file")
     parser.add_argument("--skill-path", required=True, help="Path to skill directory")
     parser.add_argument("--description", default=None, help="Override starting description")
-    parser.add_argument("--num-workers", type=int, default=10, help="Number of parallel workers")
+    parser.add_argument("--num-workers", type=int, default=10, help="Max concurrent claude -p processes")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
     parser.add_argument("--max-iterations", type=int, default=5, help="Max improvement iterations")
     parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
     parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold")
+    parser.add_argument("--early-stop", choices=["off", "exact", "wilson"], default="off", help="Stop running a query once its verdict is decided ('exact' never changes verdicts)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --early-stop wilson")
+    parser.add_argument("--hedge-percentile", type=int, default=0, help="Launch a duplicate of any run still undecided after this percentile of observed decision times (0 = off)")
+    parser.add_argument("--requests-per-minute", type=float, default=None, help="Cap on claude -p runs started per minute (concurrency also backs off automatically when the API throttles)")
+    parser.add_argument("--api-requests-per-minute", type=float, default=None, help="Cap on description improvement API requests per minute")
+    parser.add_argument("--api-tokens-per-minute", type=float, default=None, help="Cap on description improvement API tokens per minute")
+    parser.add_argument("--beam-width", type=int, default=1, help="Candidate descriptions proposed per iteration, each evaluated as soon as it is generated (implies --sandbox when > 1)")
     parser.add_argument("--holdout", type=float, default=0.4, help="Fraction of eval set to hold out for testing (0 to disable)")
     parser.add_argument("--model", required=True, help="Model for improvement")
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
     parser.add_argument("--report", default="auto", help="Generate HTML report at this path (default: 'auto' for temp file, 'none' to disable)")
-    parser.add_argument("--results-dir", default=None, help="Save all outputs (results.json, report.html, log.txt) to a timestamped subdirectory here")
+    parser.add_argument("--results-dir", default=None, help="Save all outputs (results.json, report.html, log.txt) to a timestamped subdirectory here; runs and iterations are checkpointed there as they finish")
+    parser.add_argument("--resume", default=None, help="Continue an interrupted run from its results subdirectory, reusing every checkpointed run and iteration")
+    parser.add_argument("--sandbox", action="store_true", help="Run each concurrent claude -p in its own copy of the project's .claude/ (on /dev/shm when available)")
+    parser.add_argument("--sandbox-dir", default=None, help="Where to create sandboxes (default: /dev/shm or the temp dir)")
+    parser.add_argument("--cache", action="store_true", help=f"Reuse trigger results cached in {default_cache_dir()} for the same description, project and claude binary")
+    parser.add_argument("--cache-dir", default=None, help="Trigger result cache directory (implies --cache)")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL_SECONDS, help="Seconds before a cached result expires")
     args = parser.parse_args()
 
     eval_set = json.loads(Path(args.eval_set).read_text())
@@ -285,7 +492,12 @@ def main():
         live_report_path = None
 
     # Determine output directory (create before run_loop so logs can be written)
-    if args.results_dir:
+    if args.resume:
+        results_dir = Path(args.resume)
+        if not (results_dir / RunCheckpoint.META_FILE).exists():
+            print(f"Error: No checkpoint found in {results_dir}", file=sys.stderr)
+            sys.exit(1)
+    elif args.results_dir:
         timestamp = time.strftime("%Y-%m-%d_%H%M%S")
         results_dir = Path(args.results_dir) / timestamp
         results_dir.mkdir(parents=True, exist_ok=True)
@@ -294,21 +506,76 @@ def main():
 
     log_dir = results_dir / "logs" if results_dir else None
 
-    output = run_loop(
-        eval_set=eval_set,
-        skill_path=skill_path,
-        description_override=args.description,
-        num_workers=args.num_workers,
-        timeout=args.timeout,
-        max_iterations=args.max_iterations,
-        runs_per_query=args.runs_per_query,
-        trigger_threshold=args.trigger_threshold,
-        holdout=args.holdout,
-        model=args.model,
-        verbose=args.verbose,
-        live_report_path=live_report_path,
-        log_dir=log_dir,
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = TriggerCache(Path(args.cache_dir) if args.cache_dir else default_cache_dir(), ttl_seconds=args.cache_ttl)
+        cache.prune()
+
+    checkpoint = None
+    if results_dir:
+        checkpoint = RunCheckpoint(results_dir, cache=cache)
+        try:
+            checkpoint.check_meta({
+                "skill_name": name,
+                "eval_set": eval_set_hash(eval_set),
+                "description": args.description,
+                "holdout": args.holdout,
+                "runs_per_query": args.runs_per_query,
+                "trigger_threshold": args.trigger_threshold,
+                "model": args.model,
+            })
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    sandboxes = None
+    if args.sandbox or args.beam_width > 1:
+        sandboxes = SandboxPool(find_project_root(), args.num_workers, Path(args.sandbox_dir) if args.sandbox_dir else None)
+
+    # One engine (event loop, worker limit, cache, sandboxes) for every iteration
+    engine = EvalEngine(
+        args.num_workers,
+        cache=checkpoint or cache,
+        sandboxes=sandboxes,
+        governor=RateGovernor(args.num_workers, requests_per_minute=args.requests_per_minute),
     )
+    api_governor = RateGovernor(
+        args.beam_width,
+        requests_per_minute=args.api_requests_per_minute,
+        tokens_per_minute=args.api_tokens_per_minute,
+    )
+    with engine:
+        output = run_loop(
+            eval_set=eval_set,
+            skill_path=skill_path,
+            description_override=args.description,
+            num_workers=args.num_workers,
+            timeout=args.timeout,
+            max_iterations=args.max_iterations,
+            runs_per_query=args.runs_per_query,
+            trigger_threshold=args.trigger_threshold,
+            holdout=args.holdout,
+            model=args.model,
+            verbose=args.verbose,
+            live_report_path=live_report_path,
+            log_dir=log_dir,
+            early_stop=args.early_stop,
+            confidence=args.confidence,
+            engine=engine,
+            beam_width=args.beam_width,
+            hedge_percentile=args.hedge_percentile,
+            checkpoint=checkpoint,
+            api_governor=api_governor,
+        )
+
+    if args.verbose:
+        for label, governor in (("claude -p", engine.governor), ("API", api_governor)):
+            if governor.throttles:
+                print(f"{label}: throttled {governor.throttles} times; concurrency ended at {int(governor.limit)}/{governor.max_concurrency}", file=sys.stderr)
+    if checkpoint is not None and args.verbose:
+        print(f"Checkpoint: {checkpoint.hits} runs reused", file=sys.stderr)
+    if cache is not None and args.verbose:
+        print(f"Cache: {cache.hits} hits, {cache.misses} misses", file=sys.stderr)
 
     # Save JSON output
     json_output = json.dumps(output, indent=2)
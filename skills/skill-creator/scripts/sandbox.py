@@ -0,0 +1,128 @@
+"""Per-worker project roots for concurrent trigger evaluation.
+
+When every `claude -p` runs in the same project, all workers share one
+.claude/commands/ directory: each run sees the fake skills registered by the
+others, and every file create/delete contends on the same directory. A
+SandboxPool gives each concurrent run its own lightweight copy of the
+project's .claude/ directory (on tmpfs when /dev/shm is available), reuses
+the copies across queries, and removes them at exit.
+"""
+
+import asyncio
+import atexit
+import os
+import shutil
+import tempfile
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from scripts.utils import write_command_file
+
+# Project files copied into each sandbox besides .claude/
+PROJECT_FILES = ("CLAUDE.md", "CLAUDE.local.md")
+
+# Temporary command files left by other evals (see run_eval.registered_command)
+TEMP_COMMAND_PATTERN = "*-skill-????????.md"
+
+
+def default_sandbox_base() -> Path:
+    """Prefer tmpfs so sandbox churn never touches the disk."""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
+
+
+class Sandbox:
+    """One isolated project root, holding at most one command file at a time."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.commands_dir = root / ".claude" / "commands"
+        self._command_key: tuple[str, str] | None = None
+        self._command_name: str | None = None
+
+    def ensure_command(self, skill_name: str, description: str) -> str:
+        """Register the description as this sandbox's only temp command; return its name.
+
+        Reuses the file when the sandbox already holds the same description.
+        """
+        key = (skill_name, description)
+        if self._command_key == key and self._command_name:
+            return self._command_name
+        if self._command_name:
+            (self.commands_dir / f"{self._command_name}.md").unlink(missing_ok=True)
+        self._command_name = f"{skill_name}-skill-{uuid.uuid4().hex[:8]}"
+        write_command_file(self.commands_dir, self._command_name, skill_name, description)
+        self._command_key = key
+        return self._command_name
+
+
+class SandboxPool:
+    """Lazily provisioned, reusable per-worker project roots.
+
+    Sandboxes are created on first demand, up to `size`, and handed out one
+    run at a time, so a sandbox never serves two concurrent runs.
+    """
+
+    def __init__(self, project_root: Path, size: int, base_dir: Path | None = None):
+        self.project_root = Path(project_root)
+        self.size = max(1, size)
+        self.base_dir = Path(
+            tempfile.mkdtemp(prefix="skill-eval-sandboxes-", dir=base_dir or default_sandbox_base())
+        )
+        self._sandboxes: list[Sandbox] = []
+        self._free: asyncio.Queue[Sandbox] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def _provision(self) -> Sandbox:
+        root = self.base_dir / f"worker-{len(self._sandboxes)}"
+        source = self.project_root / ".claude"
+        if source.is_dir():
+            shutil.copytree(
+                source,
+                root / ".claude",
+                symlinks=True,
+                ignore=shutil.ignore_patterns(TEMP_COMMAND_PATTERN),
+            )
+        (root / ".claude" / "commands").mkdir(parents=True, exist_ok=True)
+        for name in PROJECT_FILES:
+            if (self.project_root / name).is_file():
+                shutil.copy2(self.project_root / name, root / name)
+        sandbox = Sandbox(root)
+        self._sandboxes.append(sandbox)
+        return sandbox
+
+    @asynccontextmanager
+    async def checkout(self, skill_name: str, description: str) -> AsyncIterator[tuple[Path, str]]:
+        """Borrow a sandbox with the description registered; yields (root, command_name)."""
+        if self._closed:
+            raise RuntimeError("SandboxPool is closed")
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # asyncio queues are bound to one loop; between loops every
+            # sandbox has been returned, so rebuild the queue from all of them
+            self._loop = loop
+            self._free = asyncio.Queue()
+            for sandbox in self._sandboxes:
+                self._free.put_nowait(sandbox)
+        if self._free.empty() and len(self._sandboxes) < self.size:
+            sandbox = self._provision()
+        else:
+            sandbox = await self._free.get()
+        try:
+            command_name = sandbox.ensure_command(skill_name, description)
+            yield sandbox.root, command_name
+        finally:
+            self._free.put_nowait(sandbox)
+
+    def close(self) -> None:
+        """Remove every sandbox. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        shutil.rmtree(self.base_dir, ignore_errors=True)
@@ -0,0 +1,170 @@
+"""Incremental parsing of `claude -p --output-format stream-json` output.
+
+StreamJsonParser turns raw stdout bytes into decoded events. It only scans
+each byte once for newlines and skips lines that cannot matter for trigger
+detection (text deltas, tool results, pings) with cheap substring checks
+before paying for json.loads. TriggerDetector consumes those events and
+decides whether the skill under test was triggered.
+
+Both are independent of how the bytes are obtained, so they can be fed from
+a live subprocess, a recorded fixture, or a benchmark loop.
+"""
+
+import json
+
+
+class StreamJsonParser:
+    """Split a byte stream into JSON lines and decode only the relevant ones.
+
+    Markers are matched with their surrounding quotes. Quotes inside JSON
+    string values are always escaped, so a marker can only match structural
+    keys or values, never text the model wrote.
+    """
+
+    # stream_event lines are decoded only if they carry one of these
+    STREAM_EVENT_MARKERS = (
+        b'"content_block_start"',
+        b'"content_block_stop"',
+        b'"message_stop"',
+        b'"input_json_delta"',
+    )
+    # Any other line is decoded only if it carries one of these
+    MESSAGE_MARKERS = (b'"assistant"', b'"result"')
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scan_from = 0
+        self.bytes_read = 0
+        self.lines_seen = 0
+        self.lines_decoded = 0
+
+    def feed(self, data: bytes) -> list[dict]:
+        """Add a chunk of output and return the events completed by it."""
+        self.bytes_read += len(data)
+        self._buffer += data
+        events = []
+        start = 0
+        while True:
+            newline = self._buffer.find(b"\n", self._scan_from)
+            if newline == -1:
+                break
+            event = self._parse_line(bytes(self._buffer[start:newline]))
+            if event is not None:
+                events.append(event)
+            start = newline + 1
+            self._scan_from = start
+        if start:
+            del self._buffer[:start]
+        self._scan_from = len(self._buffer)
+        return events
+
+    def flush(self) -> list[dict]:
+        """Parse a trailing line that was not newline-terminated (at EOF)."""
+        line = bytes(self._buffer)
+        self._buffer.clear()
+        self._scan_from = 0
+        event = self._parse_line(line)
+        return [event] if event is not None else []
+
+    def accepts(self, line: bytes) -> bool:
+        """Cheap pre-filter deciding whether a line is worth JSON-decoding."""
+        markers = self.STREAM_EVENT_MARKERS if b'"stream_event"' in line else self.MESSAGE_MARKERS
+        for marker in markers:
+            if marker in line:
+                return True
+        return False
+
+    def _parse_line(self, line: bytes) -> dict | None:
+        line = line.strip()
+        if not line:
+            return None
+        self.lines_seen += 1
+        if not self.accepts(line):
+            return None
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(event, dict):
+            return None
+        self.lines_decoded += 1
+        return event
+
+
+class TriggerDetector:
+    """Decide from stream-json events whether a command was invoked.
+
+    Uses partial-message stream events (content_block_start/delta) to decide
+    as soon as the model starts a tool call, rather than waiting for the full
+    assistant message, which only arrives after tool execution. The full
+    assistant message and the final result event are fallbacks.
+
+    `process` returns True/False once decided and None while undecided;
+    `source` records which kind of event settled it.
+    """
+
+    def __init__(self, command_name: str):
+        self.command_name = command_name
+        self.triggered = False
+        self.decision: bool | None = None
+        self.source: str | None = None
+        self._pending_tool_name: str | None = None
+        self._accumulated_json = ""
+
+    def _decide(self, triggered: bool, source: str) -> bool:
+        self.decision = triggered
+        self.source = source
+        return triggered
+
+    def process(self, event: dict) -> bool | None:
+        if self.decision is not None:
+            return self.decision
+
+        event_type = event.get("type")
+
+        # Early detection via stream events
+        if event_type == "stream_event":
+            se = event.get("event", {})
+            se_type = se.get("type", "")
+
+            if se_type == "content_block_start":
+                cb = se.get("content_block", {})
+                if cb.get("type") == "tool_use":
+                    tool_name = cb.get("name", "")
+                    if tool_name in ("Skill", "Read"):
+                        self._pending_tool_name = tool_name
+                        self._accumulated_json = ""
+                    else:
+                        return self._decide(False, "stream_event")
+
+            elif se_type == "content_block_delta" and self._pending_tool_name:
+                delta = se.get("delta", {})
+                if delta.get("type") == "input_json_delta":
+                    self._accumulated_json += delta.get("partial_json", "")
+                    if self.command_name in self._accumulated_json:
+                        return self._decide(True, "stream_event")
+
+            elif se_type in ("content_block_stop", "message_stop"):
+                if self._pending_tool_name:
+                    return self._decide(self.command_name in self._accumulated_json, "stream_event")
+                if se_type == "message_stop":
+                    return self._decide(False, "stream_event")
+
+        # Fallback: full assistant message
+        elif event_type == "assistant":
+            message = event.get("message", {})
+            for content_item in message.get("content", []):
+                if content_item.get("type") != "tool_use":
+                    continue
+                tool_name = content_item.get("name", "")
+                tool_input = content_item.get("input", {})
+                if tool_name == "Skill" and self.command_name in tool_input.get("skill", ""):
+                    self.triggered = True
+                elif tool_name == "Read" and self.command_name in tool_input.get("file_path", ""):
+                    self.triggered = True
+                return self._decide(self.triggered, "assistant")
+
+        elif event_type == "result":
+            return self._decide(self.triggered, "result")
+
+        return None
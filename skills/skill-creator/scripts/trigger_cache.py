@@ -0,0 +1,180 @@
+"""On-disk cache of trigger results for run_eval.py.
+
+Every trigger check spawns a `claude -p` process, which dominates the cost of
+the optimization loop. Results are stored per run in a small SQLite database
+keyed by a hash of everything that can influence the outcome, so re-evaluating
+an unchanged (query, description) pair is free.
+
+The cache is opt-in (--cache / --cache-dir): a result only carries over when
+the claude binary and the project it runs in are the same, which the key
+records via cache_context().
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def default_cache_dir() -> Path:
+    """Return the default cache directory (respects XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "skill-creator"
+
+
+# Project files outside .claude/ that claude -p reads (see sandbox.PROJECT_FILES)
+CONTEXT_PROJECT_FILES = ("CLAUDE.md", "CLAUDE.local.md")
+
+# Temporary command files registered by evals in flight (see sandbox.TEMP_COMMAND_PATTERN)
+CONTEXT_IGNORE_PATTERN = "*-skill-????????.md"
+
+
+def cache_context(project_root: Path, claude_bin: str = "claude", sandboxed: bool = False) -> str:
+    """Fingerprint the environment a claude -p run sees, for make_cache_key.
+
+    Covers the resolved claude executable (path, size, mtime), the project
+    root, every file under its .claude/ directory except temporary command
+    files, CLAUDE.md files and whether runs are sandboxed. Recorded streams
+    replayed through scripts/replay_claude.py or a different project
+    therefore never share entries with live runs.
+    """
+    project_root = Path(project_root).resolve()
+    bin_path = shutil.which(claude_bin) or claude_bin
+    entries: list = [os.path.realpath(bin_path), str(project_root), sandboxed]
+    try:
+        st = os.stat(bin_path)
+        entries.append([st.st_size, st.st_mtime_ns])
+    except OSError:
+        entries.append(None)
+
+    claude_dir = project_root / ".claude"
+    files = [str(project_root / name) for name in CONTEXT_PROJECT_FILES]
+    for dirpath, dirnames, filenames in os.walk(claude_dir):
+        dirnames.sort()
+        files.extend(
+            os.path.join(dirpath, name)
+            for name in sorted(filenames)
+            if not fnmatch.fnmatch(name, CONTEXT_IGNORE_PATTERN)
+        )
+    digest = hashlib.sha256()
+    for path in files:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            continue
+        digest.update(os.path.relpath(path, project_root).encode("utf-8", "surrogateescape"))
+        digest.update(hashlib.sha256(content).digest())
+    entries.append(digest.hexdigest())
+    return hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    query: str,
+    skill_name: str,
+    description: str,
+    model: str | None,
+    detection_version: int,
+    context: str = "",
+) -> str:
+    """Hash the inputs that determine whether a query triggers the skill.
+
+    `context` is the cache_context() of the project and claude binary used.
+    """
+    payload = json.dumps(
+        [detection_version, skill_name, description, query, model or "", context],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TriggerCache:
+    """Per-run trigger results stored in SQLite with TTL and size eviction.
+
+    Each entry is one `claude -p` run identified by (key, run_idx), so asking
+    for more runs per query than were cached only pays for the missing ones.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Used from the EvalEngine loop thread; all access goes through _lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_dir / "trigger_cache.sqlite3", timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " key TEXT NOT NULL,"
+            " run_idx INTEGER NOT NULL,"
+            " triggered INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (key, run_idx))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at)")
+        self._conn.commit()
+
+    def __enter__(self) -> "TriggerCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get_runs(self, key: str, runs: int) -> dict[int, bool]:
+        """Return cached results for run indexes [0, runs) that are still fresh."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_idx, triggered FROM runs WHERE key = ? AND run_idx < ? AND created_at >= ?",
+                (key, runs, cutoff),
+            ).fetchall()
+        cached = {run_idx: bool(triggered) for run_idx, triggered in rows}
+        self.hits += len(cached)
+        return cached
+
+    def record_miss(self) -> None:
+        """Count one run that had to be executed because it was not cached."""
+        self.misses += 1
+
+    def put_run(self, key: str, run_idx: int, triggered: bool) -> None:
+        """Store the result of one run."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (key, run_idx, triggered, created_at) VALUES (?, ?, ?, ?)",
+                (key, run_idx, int(triggered), time.time()),
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Drop expired entries and trim to max_entries, oldest first. Returns rows removed."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM runs WHERE created_at < ?", (cutoff,)).rowcount
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()
+            if count > self.max_entries:
+                removed += self._conn.execute(
+                    "DELETE FROM runs WHERE rowid IN (SELECT rowid FROM runs ORDER BY created_at LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -45,3 +45,35 @@ def parse_skill_md(skill_path: Path) -> tuple[str, str, str]:
         i += 1
 
     return name, description, content
+
+
+def percentiles(values: list[float], points: tuple[int, ...] = (50, 95, 99)) -> dict:
+    """Linearly interpolated percentiles, keyed "p50" etc. None when values is empty."""
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    result = {}
+    for p in points:
+        rank = (len(ordered) - 1) * p / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        result[f"p{p}"] = round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 4)
+    return result
+
+
+def write_command_file(commands_dir: Path, command_name: str, skill_name: str, description: str) -> Path:
+    """Write the command file that stands in for the skill under test."""
+    commands_dir.mkdir(parents=True, exist_ok=True)
+    # Use YAML block scalar to avoid breaking on quotes in description
+    indented_desc = "\n  ".join(description.split("\n"))
+    command_content = (
+        f"---\n"
+        f"description: |\n"
+        f"  {indented_desc}\n"
+        f"---\n\n"
+        f"# {skill_name}\n\n"
+        f"This skill handles: {description}\n"
+    )
+    command_file = commands_dir / f"{command_name}.md"
+    command_file.write_text(command_content)
+    return command_file